@@ -108,7 +108,7 @@ async def reporter_node(state: AuditState) -> AuditState:
         {
             "message": "Audit complete",
             "integrity_score": result.get("integrity_score"),
-            "total_findings": len(result.get("findings", [])),
+            "total_findings": len(state.get("findings", [])),
         },
     )
     return result
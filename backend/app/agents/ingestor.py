@@ -27,7 +27,9 @@ from google.api_core.exceptions import ResourceExhausted
 
 from app.config import settings
 from app.agents.state import AuditState, MachineState
-from app.agents.ocr_engine import extract_dimensions_hybrid, ensemble_validate
+from app.agents.ocr_engine import (
+    _NUMBER_RE, extract_dimensions_hybrid, ensemble_validate, load_ocr_image, parse_numbers,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +37,10 @@ logger = logging.getLogger(__name__)
 MAX_RETRIES = 5
 INITIAL_BACKOFF = 30  # seconds
 
+# OCR is CPU-bound; when many drawings ingest at once, bound how many OCR jobs
+# run together so the Gemini stage of other drawings keeps making progress
+_ocr_semaphore = asyncio.Semaphore(max(1, settings.OCR_CONCURRENCY))
+
 # Gemini output token limit — large drawings can produce huge JSON
 MAX_OUTPUT_TOKENS = 65536
 
@@ -147,6 +153,10 @@ def _safe_response_text(response) -> str:
         logger.error("_safe_response_text fallback: %s", exc)
         return ""
 
+# Digit-run scan over space-stripped OCR text (decimal numbers use the
+# ocr_engine pattern)
+_INTEGER_RE = re.compile(r"\d+")
+
 # Grid configuration for spatial mapping
 GRID_ROWS = 6  # A-F zones (common in engineering drawings)
 GRID_COLS = 8  # 1-8 zones
@@ -475,6 +485,12 @@ Include the grid_ref for each dimension based on its position.
 """
 
 
+async def _run_ocr(func, *args, **kwargs):
+    """Run a blocking OCR step in a worker thread, bounded by the OCR semaphore."""
+    async with _ocr_semaphore:
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+
 def _configure_genai():
     genai.configure(api_key=settings.GOOGLE_API_KEY)
 
@@ -993,7 +1009,7 @@ def _verify_dimensions_with_ocr(
         for config in tesseract_configs:
             try:
                 ocr_text = pytesseract.image_to_string(img, config=config)
-                numbers = set(re.findall(r"\d+\.?\d*", ocr_text))
+                numbers = set(_NUMBER_RE.findall(ocr_text))
                 ocr_numbers.update(numbers)
                 combined_text += " " + ocr_text
                 logger.info(f"OCR pass with config '{config.split('--psm')[1][:4].strip()}' found {len(numbers)} numbers")
@@ -1002,7 +1018,7 @@ def _verify_dimensions_with_ocr(
                 continue
 
         # Also add concatenated versions (for "4 79" → "479")
-        ocr_numbers_no_space = set(re.findall(r"\d+", combined_text.replace(" ", "")))
+        ocr_numbers_no_space = set(_INTEGER_RE.findall(combined_text.replace(" ", "")))
         ocr_numbers.update(ocr_numbers_no_space)
 
         logger.info(f"Combined OCR found {len(ocr_numbers)} unique numbers across all passes")
@@ -1138,7 +1154,7 @@ def _verify_dimensions_with_region_ocr(
 
         try:
             ocr_text = pytesseract.image_to_string(crop_img, config=region_config).strip()
-            ocr_numbers = re.findall(r"\d+\.?\d*", ocr_text)
+            ocr_numbers = parse_numbers(ocr_text)
         except Exception:
             continue
 
@@ -1153,15 +1169,11 @@ def _verify_dimensions_with_region_ocr(
         # Check if OCR found something matching or close
         best_match = None
         best_diff = float("inf")
-        for n in ocr_numbers:
-            try:
-                ocr_val = float(n)
-                diff = abs(ocr_val - expected)
-                if diff < best_diff:
-                    best_diff = diff
-                    best_match = ocr_val
-            except ValueError:
-                continue
+        for ocr_val in ocr_numbers:
+            diff = abs(ocr_val - expected)
+            if diff < best_diff:
+                best_diff = diff
+                best_match = ocr_val
 
         if best_match is None:
             continue
@@ -1197,6 +1209,49 @@ def _verify_dimensions_with_region_ocr(
     return dimensions
 
 
+# Font-aware letter-to-number replacements, ordered by priority.
+# Applied sequentially (later patterns see earlier fixes), so they stay
+# separate rules — but are compiled once instead of per dimension value.
+_DIGIT_REPLACEMENT_RULES = [
+    # Zero disambiguation (critical for Helvetica)
+    (r'\bO\b', '0'),               # Standalone letter O -> 0
+    (r'\bo\b', '0'),               # Standalone letter o -> 0
+    (r'O(?=\.)', '0'),             # O before decimal -> 0
+    (r'(?<=\d)O(?=\d)', '0'),      # O between digits -> 0
+    (r'^O(?=\d)', '0'),            # O at start before digit -> 0
+    (r'(?<=\d)O$', '0'),           # O at end after digit -> 0
+    (r'(?<=\.)O(?=\d)', '0'),      # O after decimal point -> 0
+    (r'(?<=\.)O$', '0'),           # O after decimal at end -> 0
+    # One disambiguation (critical for Helvetica narrow spacing)
+    (r'\bl\b', '1'),               # Standalone lowercase L -> 1
+    (r'\bI\b', '1'),               # Standalone uppercase I -> 1
+    (r'l(?=\.)', '1'),             # l before decimal -> 1
+    (r'I(?=\.)', '1'),             # I before decimal -> 1
+    (r'^l(?=\d)', '1'),            # l at start before digit -> 1
+    (r'^I(?=\d)', '1'),            # I at start before digit -> 1
+    (r'(?<=\.)l', '1'),            # l after decimal -> 1
+    (r'(?<=\.)I', '1'),            # I after decimal -> 1
+    # Six disambiguation (Roboto small sizes)
+    (r'(?<=\d)b(?=[\d.])', '6'),   # b between digit and digit/dot -> 6
+    (r'(?<=\d)b$', '6'),           # b at end after digit -> 6
+    # Eight disambiguation (Roboto small sizes)
+    (r'(?<=\d)B(?=[\d.])', '8'),   # B between digit and digit/dot -> 8
+    # Five disambiguation
+    (r'(?<=\d)S(?=[\d.])', '5'),   # S between digit and digit/dot -> 5
+    # Two disambiguation
+    (r'(?<=\d)Z(?=[\d.])', '2'),   # Z between digit and digit/dot -> 2
+    # Four disambiguation (4 vs L — open-top 4 looks like L in technical fonts)
+    (r'(?<=\d)L(?=[\d.])', '4'),   # L between digit and digit/dot -> 4
+    (r'(?<=\d)L$', '4'),           # L at end after digit -> 4 (unless material spec)
+    (r'^L(?=\d)', '4'),            # L at start before digit -> 4
+]
+_DIGIT_REPLACEMENTS = [(re.compile(p), r) for p, r in _DIGIT_REPLACEMENT_RULES]
+
+_SPACE_DECIMAL_RE = re.compile(r'^(\d+)\s+(\d{1,3})$')
+_NON_NUMERIC_RE = re.compile(r'[^\d.]')
+_DIGIT_RE = re.compile(r'\d')
+
+
 def _normalize_dimension_value(value_str) -> Optional[float]:
     """Normalize OCR'd dimension values with font-specific character disambiguation.
 
@@ -1214,55 +1269,20 @@ def _normalize_dimension_value(value_str) -> Optional[float]:
 
     original = s
 
-    # Font-aware letter-to-number replacements, ordered by priority
-    replacements = [
-        # Zero disambiguation (critical for Helvetica)
-        (r'\bO\b', '0'),               # Standalone letter O -> 0
-        (r'\bo\b', '0'),               # Standalone letter o -> 0
-        (r'O(?=\.)', '0'),             # O before decimal -> 0
-        (r'(?<=\d)O(?=\d)', '0'),      # O between digits -> 0
-        (r'^O(?=\d)', '0'),            # O at start before digit -> 0
-        (r'(?<=\d)O$', '0'),           # O at end after digit -> 0
-        (r'(?<=\.)O(?=\d)', '0'),      # O after decimal point -> 0
-        (r'(?<=\.)O$', '0'),           # O after decimal at end -> 0
-        # One disambiguation (critical for Helvetica narrow spacing)
-        (r'\bl\b', '1'),               # Standalone lowercase L -> 1
-        (r'\bI\b', '1'),               # Standalone uppercase I -> 1
-        (r'l(?=\.)', '1'),             # l before decimal -> 1
-        (r'I(?=\.)', '1'),             # I before decimal -> 1
-        (r'^l(?=\d)', '1'),            # l at start before digit -> 1
-        (r'^I(?=\d)', '1'),            # I at start before digit -> 1
-        (r'(?<=\.)l', '1'),            # l after decimal -> 1
-        (r'(?<=\.)I', '1'),            # I after decimal -> 1
-        # Six disambiguation (Roboto small sizes)
-        (r'(?<=\d)b(?=[\d.])', '6'),   # b between digit and digit/dot -> 6
-        (r'(?<=\d)b$', '6'),           # b at end after digit -> 6
-        # Eight disambiguation (Roboto small sizes)
-        (r'(?<=\d)B(?=[\d.])', '8'),   # B between digit and digit/dot -> 8
-        # Five disambiguation
-        (r'(?<=\d)S(?=[\d.])', '5'),   # S between digit and digit/dot -> 5
-        # Two disambiguation
-        (r'(?<=\d)Z(?=[\d.])', '2'),   # Z between digit and digit/dot -> 2
-        # Four disambiguation (4 vs L — open-top 4 looks like L in technical fonts)
-        (r'(?<=\d)L(?=[\d.])', '4'),   # L between digit and digit/dot -> 4
-        (r'(?<=\d)L$', '4'),           # L at end after digit -> 4 (unless material spec)
-        (r'^L(?=\d)', '4'),            # L at start before digit -> 4
-    ]
-
-    for pattern, replacement in replacements:
-        s = re.sub(pattern, replacement, s)
+    for pattern, replacement in _DIGIT_REPLACEMENTS:
+        s = pattern.sub(replacement, s)
 
     if s != original:
         logger.info(f"Corrected letter-number confusion: '{original}' -> '{s}'")
 
     # Fix space instead of decimal point: "4 79" or "12 5"
-    match = re.match(r'^(\d+)\s+(\d{1,3})$', s)
+    match = _SPACE_DECIMAL_RE.match(s)
     if match:
         s = f"{match.group(1)}.{match.group(2)}"
         logger.info(f"Fixed space-as-decimal: '{original}' -> '{s}'")
 
     # Remove any remaining non-numeric characters (except decimal point)
-    s = re.sub(r'[^\d.]', '', s)
+    s = _NON_NUMERIC_RE.sub('', s)
 
     # Handle multiple decimal points
     if s.count('.') > 1:
@@ -1271,7 +1291,7 @@ def _normalize_dimension_value(value_str) -> Optional[float]:
         s = parts[0] + '.' + ''.join(parts[1:])
 
     # Must contain at least one digit
-    if not re.search(r'\d', s):
+    if not _DIGIT_RE.search(s):
         logger.warning(f"No digits in dimension value: {original}")
         return None
 
@@ -1760,92 +1780,72 @@ async def run_ingestor(state: AuditState) -> AuditState:
     is_rescan = crop_region is not None
 
     prompt = RESCAN_PROMPT if is_rescan else EXTRACTION_PROMPT
-    image_parts, img_size = _load_images(file_path, crop_region)
-
-    # Detect small text for adaptive processing
-    small_text_info = {"has_small_text": False, "target_dpi": 300}
-    try:
-        path = Path(file_path)
-        if path.suffix.lower() != ".pdf":
-            detect_img = Image.open(path)
-            small_text_info = _detect_small_text(np.array(detect_img))
-            if small_text_info.get("has_small_text"):
-                # Re-load with higher DPI if small text needs more aggressive upscaling
-                recommended_dpi = small_text_info.get("target_dpi", 300)
-                if recommended_dpi > 300:
-                    logger.warning(
-                        f"Small text detected ({small_text_info.get('severity')}) — "
-                        f"re-loading image at {recommended_dpi} DPI"
-                    )
-                    image_parts, img_size = _load_images(
-                        file_path, crop_region, target_dpi=recommended_dpi
-                    )
-    except Exception as e:
-        logger.warning(f"Small text detection failed (non-fatal): {e}")
-
-    model = genai.GenerativeModel(settings.VISION_MODEL)
 
-    content_parts = []
-    for img in image_parts:
-        content_parts.append({"inline_data": img})
-    content_parts.append(prompt)
-
-    # Log content parts for debugging
-    logger.info(
-        "Ingestor: sending %s to Gemini (%s, %d content parts)",
-        "rescan" if is_rescan else "extraction",
-        settings.VISION_MODEL, len(content_parts),
+    # Tesseract extraction only needs the file, not Gemini's output — run it in
+    # a worker thread so it overlaps the network-bound Gemini call below.
+    # Decode once — the Tesseract pass here and the optional CNN pass below
+    # share the pixels
+    ocr_image = await asyncio.to_thread(load_ocr_image, file_path)
+    tesseract_task = asyncio.create_task(
+        _run_ocr(
+            extract_dimensions_hybrid, file_path,
+            use_tesseract=True, use_cnn=False, image=ocr_image,
+        )
     )
-    for i, part in enumerate(content_parts):
-        if isinstance(part, dict):
-            logger.info(
-                "  Part %d: %s (%dKB)",
-                i, part.get("mime_type", "unknown"), len(part.get("data", "")) // 1024,
-            )
-        else:
-            logger.info("  Part %d: text prompt (%d chars)", i, len(str(part)))
 
-    # Retry logic with exponential backoff for rate limiting
-    response = None
-    for attempt in range(MAX_RETRIES):
+    try:
+        image_parts, img_size = _load_images(file_path, crop_region)
+
+        # Detect small text for adaptive processing
+        small_text_info = {"has_small_text": False, "target_dpi": 300}
         try:
-            logger.info("Ingestor: Gemini API call attempt %d/%d...", attempt + 1, MAX_RETRIES)
-            response = await model.generate_content_async(
-                content_parts,
-                generation_config=genai.GenerationConfig(
-                    response_mime_type="application/json",
-                    temperature=0.1,
-                    max_output_tokens=MAX_OUTPUT_TOKENS,
-                ),
-                safety_settings=SAFETY_SETTINGS,
-                request_options={"timeout": 600},
-            )
-            break  # Success, exit retry loop
-        except ResourceExhausted as e:
-            if attempt < MAX_RETRIES - 1:
-                backoff = INITIAL_BACKOFF * (2 ** attempt)
-                logger.warning(f"Rate limited (429). Waiting {backoff}s before retry {attempt + 2}/{MAX_RETRIES}...")
-                await asyncio.sleep(backoff)
+            path = Path(file_path)
+            if path.suffix.lower() != ".pdf":
+                detect_img = Image.open(path)
+                small_text_info = _detect_small_text(np.array(detect_img))
+                if small_text_info.get("has_small_text"):
+                    # Re-load with higher DPI if small text needs more aggressive upscaling
+                    recommended_dpi = small_text_info.get("target_dpi", 300)
+                    if recommended_dpi > 300:
+                        logger.warning(
+                            f"Small text detected ({small_text_info.get('severity')}) — "
+                            f"re-loading image at {recommended_dpi} DPI"
+                        )
+                        image_parts, img_size = _load_images(
+                            file_path, crop_region, target_dpi=recommended_dpi
+                        )
+        except Exception as e:
+            logger.warning(f"Small text detection failed (non-fatal): {e}")
+
+        model = genai.GenerativeModel(settings.VISION_MODEL)
+
+        content_parts = []
+        for img in image_parts:
+            content_parts.append({"inline_data": img})
+        content_parts.append(prompt)
+
+        # Log content parts for debugging
+        logger.info(
+            "Ingestor: sending %s to Gemini (%s, %d content parts)",
+            "rescan" if is_rescan else "extraction",
+            settings.VISION_MODEL, len(content_parts),
+        )
+        for i, part in enumerate(content_parts):
+            if isinstance(part, dict):
+                logger.info(
+                    "  Part %d: %s (%dKB)",
+                    i, part.get("mime_type", "unknown"), len(part.get("data", "")) // 1024,
+                )
             else:
-                logger.error("Rate limit exhausted after max retries")
-                raise
-
-    if response is None:
-        raise RuntimeError("Failed to get response from Gemini API")
+                logger.info("  Part %d: text prompt (%d chars)", i, len(str(part)))
 
-    # Validate response and extract text (handles safety blocks, truncation, etc.)
-    raw_text = ""
-    try:
-        raw_text, finish_reason = _check_gemini_response(response)
-    except RuntimeError as resp_err:
-        # If safety-blocked, retry with a simplified prompt
-        if "safety" in str(resp_err).lower():
-            logger.warning("Main prompt safety-blocked — retrying with simplified prompt")
+        # Retry logic with exponential backoff for rate limiting
+        response = None
+        for attempt in range(MAX_RETRIES):
             try:
-                simple_parts = [p for p in content_parts if isinstance(p, dict)]
-                simple_parts.append(SIMPLE_EXTRACTION_PROMPT)
-                retry_response = await model.generate_content_async(
-                    simple_parts,
+                logger.info("Ingestor: Gemini API call attempt %d/%d...", attempt + 1, MAX_RETRIES)
+                response = await model.generate_content_async(
+                    content_parts,
                     generation_config=genai.GenerationConfig(
                         response_mime_type="application/json",
                         temperature=0.1,
@@ -1854,167 +1854,212 @@ async def run_ingestor(state: AuditState) -> AuditState:
                     safety_settings=SAFETY_SETTINGS,
                     request_options={"timeout": 600},
                 )
-                raw_text, finish_reason = _check_gemini_response(retry_response)
-                logger.info("Simplified prompt retry succeeded (%d chars)", len(raw_text))
-            except Exception as retry_err:
-                logger.error("Simplified prompt retry also failed: %s", retry_err)
-                raise resp_err from retry_err
-        else:
-            raise
-
-    # Log raw response for debugging
-    response_len = len(raw_text)
-    logger.info(f"Gemini response length: {response_len} chars")
-    if response_len == 0:
-        logger.error("Gemini returned empty response!")
-    elif response_len < 500:
-        logger.info(f"Gemini raw response: {raw_text}")
-    else:
-        logger.info(f"Gemini response preview: {raw_text[:500]}...")
-
-    def fix_json(text: str) -> dict:
-        """Attempt to fix and parse malformed JSON from Gemini."""
-        # Find JSON object
-        start = text.find("{")
-        end = text.rfind("}") + 1
-        if start < 0 or end <= start:
-            return {}
-        text = text[start:end]
-        # Fix trailing commas before ] or }
-        text = re.sub(r',\s*([}\]])', r'\1', text)
-        # Fix unquoted None/null
-        text = re.sub(r':\s*None\b', ': null', text)
-        # Try parsing
+                break  # Success, exit retry loop
+            except ResourceExhausted as e:
+                if attempt < MAX_RETRIES - 1:
+                    backoff = INITIAL_BACKOFF * (2 ** attempt)
+                    logger.warning(f"Rate limited (429). Waiting {backoff}s before retry {attempt + 2}/{MAX_RETRIES}...")
+                    await asyncio.sleep(backoff)
+                else:
+                    logger.error("Rate limit exhausted after max retries")
+                    raise
+
+        if response is None:
+            raise RuntimeError("Failed to get response from Gemini API")
+
+        # Validate response and extract text (handles safety blocks, truncation, etc.)
+        raw_text = ""
         try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            pass
+            raw_text, finish_reason = _check_gemini_response(response)
+        except RuntimeError as resp_err:
+            # If safety-blocked, retry with a simplified prompt
+            if "safety" in str(resp_err).lower():
+                logger.warning("Main prompt safety-blocked — retrying with simplified prompt")
+                try:
+                    simple_parts = [p for p in content_parts if isinstance(p, dict)]
+                    simple_parts.append(SIMPLE_EXTRACTION_PROMPT)
+                    retry_response = await model.generate_content_async(
+                        simple_parts,
+                        generation_config=genai.GenerationConfig(
+                            response_mime_type="application/json",
+                            temperature=0.1,
+                            max_output_tokens=MAX_OUTPUT_TOKENS,
+                        ),
+                        safety_settings=SAFETY_SETTINGS,
+                        request_options={"timeout": 600},
+                    )
+                    raw_text, finish_reason = _check_gemini_response(retry_response)
+                    logger.info("Simplified prompt retry succeeded (%d chars)", len(raw_text))
+                except Exception as retry_err:
+                    logger.error("Simplified prompt retry also failed: %s", retry_err)
+                    raise resp_err from retry_err
+            else:
+                raise
+
+        # Log raw response for debugging
+        response_len = len(raw_text)
+        logger.info(f"Gemini response length: {response_len} chars")
+        if response_len == 0:
+            logger.error("Gemini returned empty response!")
+        elif response_len < 500:
+            logger.info(f"Gemini raw response: {raw_text}")
+        else:
+            logger.info(f"Gemini response preview: {raw_text[:500]}...")
+
+        def fix_json(text: str) -> dict:
+            """Attempt to fix and parse malformed JSON from Gemini."""
+            # Find JSON object
+            start = text.find("{")
+            end = text.rfind("}") + 1
+            if start < 0 or end <= start:
+                return {}
+            text = text[start:end]
+            # Fix trailing commas before ] or }
+            text = re.sub(r',\s*([}\]])', r'\1', text)
+            # Fix unquoted None/null
+            text = re.sub(r':\s*None\b', ': null', text)
+            # Try parsing
+            try:
+                return json.loads(text)
+            except json.JSONDecodeError:
+                pass
 
-        # Extract individual dimension objects using balanced brace matching
-        dimensions = []
-        dims_start = text.find('"dimensions"')
-        if dims_start >= 0:
-            # Find the opening bracket
-            bracket_start = text.find('[', dims_start)
-            if bracket_start >= 0:
-                # Parse each dimension object by matching braces
-                i = bracket_start + 1
-                while i < len(text):
-                    # Skip whitespace
-                    while i < len(text) and text[i] in ' \t\n\r,':
-                        i += 1
-                    if i >= len(text) or text[i] == ']':
-                        break
-                    if text[i] == '{':
-                        # Find matching closing brace
-                        depth = 1
-                        obj_start = i
-                        i += 1
-                        while i < len(text) and depth > 0:
-                            if text[i] == '{':
-                                depth += 1
-                            elif text[i] == '}':
-                                depth -= 1
+            # Extract individual dimension objects using balanced brace matching
+            dimensions = []
+            dims_start = text.find('"dimensions"')
+            if dims_start >= 0:
+                # Find the opening bracket
+                bracket_start = text.find('[', dims_start)
+                if bracket_start >= 0:
+                    # Parse each dimension object by matching braces
+                    i = bracket_start + 1
+                    while i < len(text):
+                        # Skip whitespace
+                        while i < len(text) and text[i] in ' \t\n\r,':
+                            i += 1
+                        if i >= len(text) or text[i] == ']':
+                            break
+                        if text[i] == '{':
+                            # Find matching closing brace
+                            depth = 1
+                            obj_start = i
+                            i += 1
+                            while i < len(text) and depth > 0:
+                                if text[i] == '{':
+                                    depth += 1
+                                elif text[i] == '}':
+                                    depth -= 1
+                                i += 1
+                            if depth == 0:
+                                obj_text = text[obj_start:i]
+                                # Fix and parse this object
+                                obj_text = re.sub(r',\s*}', '}', obj_text)
+                                obj_text = re.sub(r':\s*None\b', ': null', obj_text)
+                                try:
+                                    dim = json.loads(obj_text)
+                                    if 'value' in dim or 'coordinates' in dim:
+                                        dimensions.append(dim)
+                                except json.JSONDecodeError:
+                                    pass
+                        else:
                             i += 1
-                        if depth == 0:
-                            obj_text = text[obj_start:i]
-                            # Fix and parse this object
-                            obj_text = re.sub(r',\s*}', '}', obj_text)
-                            obj_text = re.sub(r':\s*None\b', ': null', obj_text)
-                            try:
-                                dim = json.loads(obj_text)
-                                if 'value' in dim or 'coordinates' in dim:
-                                    dimensions.append(dim)
-                            except json.JSONDecodeError:
-                                pass
-                    else:
-                        i += 1
-
-        if dimensions:
-            logger.info(f"fix_json recovered {len(dimensions)} dimensions from truncated response")
-            return {"dimensions": dimensions, "zones": [], "part_list": [], "gdt_callouts": []}
-
-        return {}
 
-    try:
-        logger.info(f"Raw Gemini response (first 2000 chars): {raw_text[:2000] if raw_text else 'None'}")
-        extracted = json.loads(raw_text)
-        logger.info(f"Parsed type: {type(extracted).__name__}")
-        # Gemini sometimes wraps the object in an array — unwrap it
-        if isinstance(extracted, list):
-            if len(extracted) == 1 and isinstance(extracted[0], dict):
-                extracted = extracted[0]
-                logger.info("Unwrapped single-element array to dict")
-            elif len(extracted) > 1:
-                # Merge multiple dicts into one
-                merged = {}
-                for item in extracted:
-                    if isinstance(item, dict):
-                        for k, v in item.items():
-                            if k in merged and isinstance(merged[k], list) and isinstance(v, list):
-                                merged[k].extend(v)
-                            else:
-                                merged[k] = v
-                extracted = merged
-                logger.info("Merged %d array elements into single dict", len(extracted))
-            else:
-                extracted = {}
-        logger.info(f"JSON parsed successfully: {len(extracted.get('dimensions', []))} dimensions")
-    except json.JSONDecodeError as e:
-        logger.warning(f"JSON parse failed: {e}, attempting fix_json")
-        extracted = fix_json(raw_text)
-        if not extracted or not extracted.get("dimensions"):
-            logger.error(f"fix_json returned empty result, response was: {raw_text[:1000] if raw_text else 'None'}")
-
-    # Phase 0: Normalize text fields (letters in tolerance classes, datums, materials, etc.)
-    extracted = _validate_and_normalize_text_fields(extracted)
-
-    # Phase 1: Build entity registry from BOM
-    part_list = extracted.get("part_list", [])
-    entity_registry = _build_entity_registry(part_list)
-
-    # Phase 2: Enrich zones with grid references
-    zones = extracted.get("zones", [])
-    zones = _enrich_zones_with_grid(zones, img_size)
-    extracted["zones"] = zones
-
-    # Phase 3: Bind dimensions to entities and add grid refs
-    dimensions = extracted.get("dimensions", [])
-    dimensions = _bind_dimensions_to_entities(dimensions, entity_registry, img_size)
-
-    # Phase 3b: Validate and adjust coordinates to ensure they land on drawing content
-    dimensions = _validate_and_adjust_coordinates(dimensions, file_path, img_size)
-
-    # Phase 3c: OCR verification of extracted values (full-image)
-    dimensions = _verify_dimensions_with_ocr(dimensions, file_path)
-
-    # Phase 3c2: Region-based OCR for per-dimension verification (small digit accuracy)
-    dimensions = _verify_dimensions_with_region_ocr(dimensions, file_path, img_size)
-
-    # Phase 3d: Quality check for letter-number confusion
-    invalid_count = sum(1 for d in dimensions if d.get("validation_failed"))
-    normalized_count = sum(1 for d in dimensions if d.get("value_normalized"))
-    if invalid_count > 0:
-        logger.warning(
-            f"Found {invalid_count} dimensions with validation issues (possible letter-number confusion)"
+            if dimensions:
+                logger.info(f"fix_json recovered {len(dimensions)} dimensions from truncated response")
+                return {"dimensions": dimensions, "zones": [], "part_list": [], "gdt_callouts": []}
+
+            return {}
+
+        try:
+            logger.info(f"Raw Gemini response (first 2000 chars): {raw_text[:2000] if raw_text else 'None'}")
+            extracted = json.loads(raw_text)
+            logger.info(f"Parsed type: {type(extracted).__name__}")
+            # Gemini sometimes wraps the object in an array — unwrap it
+            if isinstance(extracted, list):
+                if len(extracted) == 1 and isinstance(extracted[0], dict):
+                    extracted = extracted[0]
+                    logger.info("Unwrapped single-element array to dict")
+                elif len(extracted) > 1:
+                    # Merge multiple dicts into one
+                    merged = {}
+                    for item in extracted:
+                        if isinstance(item, dict):
+                            for k, v in item.items():
+                                if k in merged and isinstance(merged[k], list) and isinstance(v, list):
+                                    merged[k].extend(v)
+                                else:
+                                    merged[k] = v
+                    extracted = merged
+                    logger.info("Merged %d array elements into single dict", len(extracted))
+                else:
+                    extracted = {}
+            logger.info(f"JSON parsed successfully: {len(extracted.get('dimensions', []))} dimensions")
+        except json.JSONDecodeError as e:
+            logger.warning(f"JSON parse failed: {e}, attempting fix_json")
+            extracted = fix_json(raw_text)
+            if not extracted or not extracted.get("dimensions"):
+                logger.error(f"fix_json returned empty result, response was: {raw_text[:1000] if raw_text else 'None'}")
+
+        # Phase 0: Normalize text fields (letters in tolerance classes, datums, materials, etc.)
+        extracted = _validate_and_normalize_text_fields(extracted)
+
+        # Phase 1: Build entity registry from BOM
+        part_list = extracted.get("part_list", [])
+        entity_registry = _build_entity_registry(part_list)
+
+        # Phase 2: Enrich zones with grid references
+        zones = extracted.get("zones", [])
+        zones = _enrich_zones_with_grid(zones, img_size)
+        extracted["zones"] = zones
+
+        # Phase 3: Bind dimensions to entities and add grid refs
+        dimensions = extracted.get("dimensions", [])
+        dimensions = _bind_dimensions_to_entities(dimensions, entity_registry, img_size)
+
+        # Phase 3b: Validate and adjust coordinates to ensure they land on drawing content
+        dimensions = _validate_and_adjust_coordinates(dimensions, file_path, img_size)
+
+        # Phase 3c: OCR verification of extracted values (full-image)
+        dimensions = await _run_ocr(_verify_dimensions_with_ocr, dimensions, file_path)
+
+        # Phase 3c2: Region-based OCR for per-dimension verification (small digit accuracy)
+        dimensions = await _run_ocr(
+            _verify_dimensions_with_region_ocr, dimensions, file_path, img_size
         )
-    if normalized_count > 0:
-        logger.info(f"Normalized {normalized_count} dimension values (letter-number corrections applied)")
 
-    # Phase 3e: Font-specific error validation
-    dimensions = _validate_font_specific_errors(dimensions)
+        # Phase 3d: Quality check for letter-number confusion
+        invalid_count = sum(1 for d in dimensions if d.get("validation_failed"))
+        normalized_count = sum(1 for d in dimensions if d.get("value_normalized"))
+        if invalid_count > 0:
+            logger.warning(
+                f"Found {invalid_count} dimensions with validation issues (possible letter-number confusion)"
+            )
+        if normalized_count > 0:
+            logger.info(f"Normalized {normalized_count} dimension values (letter-number corrections applied)")
 
-    # Phase 3e2: CNN-based OCR validation (EasyOCR)
-    # Only use CNN for small text or low-confidence scenarios to avoid overhead
-    use_cnn = settings.USE_CNN_OCR and (
-        small_text_info.get("has_small_text") or
-        sum(1 for d in dimensions if d.get("confidence", 1.0) < 0.7) > 3
-    )
+        # Phase 3e: Font-specific error validation
+        dimensions = _validate_font_specific_errors(dimensions)
+
+        # Phase 3e2: CNN-based OCR validation (EasyOCR)
+        # Only use CNN for small text or low-confidence scenarios to avoid overhead
+        use_cnn = settings.USE_CNN_OCR and (
+            small_text_info.get("has_small_text") or
+            sum(1 for d in dimensions if d.get("confidence", 1.0) < 0.7) > 3
+        )
+
+        tesseract_dims, _ = await tesseract_task
+    finally:
+        # On an early failure (Gemini retries exhausted, safety block, ...) wait
+        # for the OCR task instead of cancelling it: its worker thread can't be
+        # interrupted, and cancelling would release the OCR slot while the
+        # thread keeps running. Gathering also retrieves a failed task's error.
+        await asyncio.gather(tesseract_task, return_exceptions=True)
 
     if use_cnn:
         logger.info("Running hybrid OCR validation (Tesseract + CNN) — small text or low confidence detected")
-        tesseract_dims, cnn_dims = extract_dimensions_hybrid(
-            file_path, use_tesseract=True, use_cnn=True
+        _, cnn_dims = await _run_ocr(
+            extract_dimensions_hybrid, file_path,
+            use_tesseract=False, use_cnn=True, image=ocr_image,
         )
         dimensions = ensemble_validate(
             dimensions, tesseract_dims, cnn_dims,
@@ -2022,9 +2067,6 @@ async def run_ingestor(state: AuditState) -> AuditState:
         )
     else:
         logger.info("Skipping CNN OCR (clean image, high confidence) — Tesseract-only verification")
-        tesseract_dims, _ = extract_dimensions_hybrid(
-            file_path, use_tesseract=True, use_cnn=False
-        )
         dimensions = ensemble_validate(
             dimensions, tesseract_dims, [],
             consensus_threshold=1
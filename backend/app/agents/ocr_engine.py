@@ -1,33 +1,74 @@
 """Hybrid OCR engine combining traditional (Tesseract) and CNN-based (EasyOCR) approaches."""
 
+import copy
+import hashlib
 import logging
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 import cv2
 import numpy as np
 from PIL import Image
 
+from app.config import settings
+
 logger = logging.getLogger(__name__)
 
+# Numbers with an optional decimal part, compiled once for the per-region scans
+_NUMBER_RE = re.compile(r'\d+\.?\d*')
+
+
+@lru_cache(maxsize=4096)
+def parse_numbers(text: str) -> Tuple[float, ...]:
+    """Return every number found in an OCR string, in order.
+
+    Shared by all OCR engines; cached because the same tokens are parsed
+    again across passes and validation.
+    """
+    return tuple(float(n) for n in _NUMBER_RE.findall(text))
+
 # Lazy load EasyOCR to avoid startup overhead
 _easyocr_reader = None
+# OCR may run from worker threads concurrently — guard the one-time load
+_easyocr_lock = threading.Lock()
+
+# LRU of EasyOCR results keyed by (image content hash, region)
+CNN_CACHE_SIZE = 64
+_cnn_cache: "OrderedDict[tuple, List[Dict]]" = OrderedDict()
+_cnn_cache_lock = threading.Lock()
 
 
 def _get_easyocr_reader():
     """Lazy-load EasyOCR reader (CNN-based) for character recognition."""
     global _easyocr_reader
     if _easyocr_reader is None:
-        import easyocr
-        logger.info("Initializing EasyOCR CNN model (one-time setup)...")
-        # Use English only, GPU=False for CPU efficiency
-        _easyocr_reader = easyocr.Reader(['en'], gpu=False, verbose=False)
-        logger.info("EasyOCR CNN model loaded")
+        with _easyocr_lock:
+            if _easyocr_reader is None:
+                import easyocr
+                if settings.CNN_OCR_NUM_THREADS > 0:
+                    # EasyOCR shares the host with Tesseract subprocesses and
+                    # concurrent requests; cap torch's pool to avoid oversubscription
+                    import torch
+                    torch.set_num_threads(settings.CNN_OCR_NUM_THREADS)
+                logger.info("Initializing EasyOCR CNN model (one-time setup)...")
+                # Use English only, GPU=False for CPU efficiency. On CPU, EasyOCR
+                # applies int8 dynamic quantization to both models by default
+                _easyocr_reader = easyocr.Reader(
+                    ['en'], gpu=False, verbose=False,
+                    quantize=settings.CNN_OCR_QUANTIZE,
+                )
+                logger.info("EasyOCR CNN model loaded")
     return _easyocr_reader
 
 
 def extract_dimensions_with_cnn(
-    image_path: str,
-    region: Optional[Dict] = None
+    image_path: Optional[str],
+    region: Optional[Dict] = None,
+    image: Optional[np.ndarray] = None,
 ) -> List[Dict]:
     """Extract dimension text using CNN-based OCR (EasyOCR).
 
@@ -41,11 +82,58 @@ def extract_dimensions_with_cnn(
     - Rotated text
     - Low-contrast images
     - Similar characters (0/O, 1/I/l)
+
+    ``image`` may carry the already-decoded pixels of ``image_path`` so callers
+    that also run Tesseract don't decode the file twice. ``image_path`` may be
+    None when the pixels only exist in memory (e.g. a rasterized PDF page).
     """
+    if image_path is None and image is None:
+        return []
+
+    if image is not None:
+        # Already decoded — hash the pixels rather than reading the file again
+        image = np.ascontiguousarray(image)
+        digest = (image.shape, hashlib.sha256(image.data).hexdigest())
+        image_path = image_path or "<in-memory image>"
+    else:
+        try:
+            digest = hashlib.sha256(Path(image_path).read_bytes()).hexdigest()
+        except OSError:
+            logger.error(f"Could not load image: {image_path}")
+            return []
+
+    # Same drawing is OCR'd repeatedly (ingestion, reviews, retries) — often via
+    # freshly rasterized temp files, so key on content rather than path
+    key = (digest, tuple(sorted(region.items())) if region else None)
+    with _cnn_cache_lock:
+        cached = _cnn_cache.get(key)
+        if cached is not None:
+            _cnn_cache.move_to_end(key)
+    if cached is not None:
+        logger.info(f"EasyOCR (CNN) cache hit for {image_path}")
+        return copy.deepcopy(cached)
+
+    dimensions = _run_cnn_ocr(image_path, region, image)
+
+    with _cnn_cache_lock:
+        _cnn_cache[key] = dimensions
+        _cnn_cache.move_to_end(key)
+        while len(_cnn_cache) > CNN_CACHE_SIZE:
+            _cnn_cache.popitem(last=False)
+
+    return copy.deepcopy(dimensions)
+
+
+def _run_cnn_ocr(
+    image_path: str,
+    region: Optional[Dict] = None,
+    image: Optional[np.ndarray] = None,
+) -> List[Dict]:
+    """Run EasyOCR on an image (uncached) and parse dimension values."""
     reader = _get_easyocr_reader()
 
-    # Load image
-    img = cv2.imread(image_path)
+    # Load image unless the caller already decoded it
+    img = image if image is not None else cv2.imread(image_path)
     if img is None:
         logger.error(f"Could not load image: {image_path}")
         return []
@@ -74,43 +162,38 @@ def extract_dimensions_with_cnn(
         low_text=0.4,     # Detection threshold
     )
 
+    # Bounding box extents for all regions at once
+    # each bbox is [[x1,y1], [x2,y2], [x3,y3], [x4,y4]] -> (N, 4, 2)
+    if results:
+        boxes = np.array([r[0] for r in results], dtype=np.float64)
+        mins = boxes.min(axis=1).astype(np.int64).tolist()
+        maxs = boxes.max(axis=1).astype(np.int64).tolist()
+    else:
+        mins = maxs = []
+
     # Parse results
     dimensions = []
-    for (bbox, text, confidence) in results:
-        # Extract bounding box coordinates
-        # bbox is [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
-        x_coords = [point[0] for point in bbox]
-        y_coords = [point[1] for point in bbox]
-
-        x_min, x_max = int(min(x_coords)), int(max(x_coords))
-        y_min, y_max = int(min(y_coords)), int(max(y_coords))
-
+    for (_, text, confidence), (x_min, y_min), (x_max, y_max) in zip(results, mins, maxs):
         # Center of bounding box
         center_x = (x_min + x_max) // 2
         center_y = (y_min + y_max) // 2
 
         # Try to parse as dimension value
         # Look for numbers with optional decimal points
-        numbers = re.findall(r'\d+\.?\d*', text)
-
-        for num_str in numbers:
-            try:
-                value = float(num_str)
-                dimensions.append({
-                    "value": value,
-                    "text": text,
-                    "confidence": confidence,
-                    "coordinates": {"x": center_x, "y": center_y},
-                    "bbox": {
-                        "x": x_min,
-                        "y": y_min,
-                        "width": x_max - x_min,
-                        "height": y_max - y_min
-                    },
-                    "method": "cnn_easyocr"
-                })
-            except ValueError:
-                continue
+        for value in parse_numbers(text):
+            dimensions.append({
+                "value": value,
+                "text": text,
+                "confidence": confidence,
+                "coordinates": {"x": center_x, "y": center_y},
+                "bbox": {
+                    "x": x_min,
+                    "y": y_min,
+                    "width": x_max - x_min,
+                    "height": y_max - y_min
+                },
+                "method": "cnn_easyocr"
+            })
 
     avg_conf = np.mean([d['confidence'] for d in dimensions]) if dimensions else 0.0
     logger.info(
@@ -121,10 +204,50 @@ def extract_dimensions_with_cnn(
     return dimensions
 
 
+def _extract_dimensions_with_tesseract(gray: np.ndarray) -> List[Dict]:
+    """Extract dimension values from a grayscale image with Tesseract."""
+    import pytesseract
+    from pytesseract import Output
+
+    tesseract_dims = []
+    try:
+        ocr_data = pytesseract.image_to_data(gray, output_type=Output.DICT)
+
+        for i in range(len(ocr_data['text'])):
+            text = ocr_data['text'][i].strip()
+            if not text or ocr_data['conf'][i] < 30:
+                continue
+
+            for value in parse_numbers(text):
+                tesseract_dims.append({
+                    "value": value,
+                    "text": text,
+                    "confidence": ocr_data['conf'][i] / 100.0,
+                    "coordinates": {
+                        "x": ocr_data['left'][i] + ocr_data['width'][i] // 2,
+                        "y": ocr_data['top'][i] + ocr_data['height'][i] // 2
+                    },
+                    "method": "tesseract"
+                })
+    except Exception as e:
+        logger.warning(f"Tesseract extraction failed: {e}")
+
+    return tesseract_dims
+
+
+def load_ocr_image(image_path: str) -> Optional[np.ndarray]:
+    """Decode a drawing to grayscale for OCR; None if it can't be read."""
+    gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        logger.warning(f"Could not load image for OCR: {image_path}")
+    return gray
+
+
 def extract_dimensions_hybrid(
     image_path: str,
     use_tesseract: bool = True,
-    use_cnn: bool = True
+    use_cnn: bool = True,
+    image: Optional[np.ndarray] = None,
 ) -> Tuple[List[Dict], List[Dict]]:
     """Hybrid approach: combine Tesseract (fast, traditional) and EasyOCR (accurate, CNN).
 
@@ -132,49 +255,33 @@ def extract_dimensions_hybrid(
     - Tesseract: Fast, good for clean text, standard fonts
     - EasyOCR (CNN): Slower, better for small/rotated/low-quality text
 
+    The image is decoded once and shared by both engines, which run
+    concurrently (Tesseract in a subprocess, EasyOCR in torch — both release
+    the GIL). Callers that run the engines in separate calls can pass the
+    grayscale pixels from ``load_ocr_image`` as ``image`` to skip re-decoding.
+
     Returns both results for ensemble validation.
     """
     tesseract_dims = []
     cnn_dims = []
 
-    if use_tesseract:
-        # Use existing Tesseract extraction
-        import pytesseract
-        from pytesseract import Output
-
-        img = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
-        if img is not None:
-            try:
-                ocr_data = pytesseract.image_to_data(img, output_type=Output.DICT)
-
-                for i in range(len(ocr_data['text'])):
-                    text = ocr_data['text'][i].strip()
-                    if not text or ocr_data['conf'][i] < 30:
-                        continue
-
-                    numbers = re.findall(r'\d+\.?\d*', text)
-                    for num_str in numbers:
-                        try:
-                            value = float(num_str)
-                            tesseract_dims.append({
-                                "value": value,
-                                "text": text,
-                                "confidence": ocr_data['conf'][i] / 100.0,
-                                "coordinates": {
-                                    "x": ocr_data['left'][i] + ocr_data['width'][i] // 2,
-                                    "y": ocr_data['top'][i] + ocr_data['height'][i] // 2
-                                },
-                                "method": "tesseract"
-                            })
-                        except ValueError:
-                            continue
-            except Exception as e:
-                logger.warning(f"Tesseract extraction failed: {e}")
-        else:
-            logger.warning(f"Could not load image for Tesseract: {image_path}")
-
-    if use_cnn:
-        cnn_dims = extract_dimensions_with_cnn(image_path)
+    if not (use_tesseract or use_cnn):
+        return tesseract_dims, cnn_dims
+
+    gray = image if image is not None else load_ocr_image(image_path)
+    if gray is None:
+        return tesseract_dims, cnn_dims
+
+    if use_tesseract and use_cnn:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            tesseract_future = pool.submit(_extract_dimensions_with_tesseract, gray)
+            cnn_future = pool.submit(extract_dimensions_with_cnn, image_path, None, gray)
+            tesseract_dims = tesseract_future.result()
+            cnn_dims = cnn_future.result()
+    elif use_tesseract:
+        tesseract_dims = _extract_dimensions_with_tesseract(gray)
+    else:
+        cnn_dims = extract_dimensions_with_cnn(image_path, image=gray)
 
     logger.info(
         f"Hybrid OCR: Tesseract found {len(tesseract_dims)}, "
@@ -184,6 +291,68 @@ def extract_dimensions_hybrid(
     return tesseract_dims, cnn_dims
 
 
+def _build_value_index(dims: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """Sort OCR values (and their coordinates) once for windowed lookups.
+
+    Matching requires values within 1% before distance is even considered,
+    so each Gemini value only needs to inspect a narrow slice of the sorted
+    array instead of every OCR detection.
+    """
+    if not dims:
+        return np.empty(0, dtype=np.float64), np.empty((0, 2), dtype=np.float64)
+
+    values = np.array([d["value"] for d in dims], dtype=np.float64)
+    xy = np.array(
+        [
+            ((d.get("coordinates") or {}).get("x", 0), (d.get("coordinates") or {}).get("y", 0))
+            for d in dims
+        ],
+        dtype=np.float64,
+    )
+    order = np.argsort(values, kind="stable")
+    return values[order], xy[order]
+
+
+def _match_against_index(
+    index: Tuple[np.ndarray, np.ndarray],
+    g_values: np.ndarray,
+    g_xy: np.ndarray,
+    max_dist: float = 50,
+) -> np.ndarray:
+    """For each Gemini value, check whether an indexed method found it nearby.
+
+    Returns a boolean array aligned with g_values: True where the method has a
+    value within 1% located within max_dist pixels.
+    """
+    values, xy = index
+    max_dist_sq = max_dist * max_dist
+    matched = np.zeros(g_values.shape[0], dtype=bool)
+    if values.size == 0 or g_values.size == 0:
+        return matched
+
+    # Any value within 1% of g lies inside [lo, hi] — locate all windows at once
+    lo = np.minimum(g_values * 0.99, g_values / 0.99)
+    hi = np.maximum(g_values * 0.99, g_values / 0.99)
+    starts = np.searchsorted(values, lo, side="left")
+    ends = np.searchsorted(values, hi, side="right")
+
+    for i in np.flatnonzero(ends > starts):
+        g = g_values[i]
+        if g == 0:
+            # Exact zero matches regardless of position
+            matched[i] = True
+            continue
+        start, end = starts[i], ends[i]
+        candidates = values[start:end]
+        close = np.abs(g - candidates) / np.maximum(abs(g), np.abs(candidates)) < 0.01
+        # Compare squared distances — no sqrt needed for a threshold test
+        diff = xy[start:end] - g_xy[i]
+        dist_sq = np.einsum("ij,ij->i", diff, diff)
+        matched[i] = np.any(close & (dist_sq < max_dist_sq))
+
+    return matched
+
+
 def ensemble_validate(
     gemini_dims: List[Dict],
     tesseract_dims: List[Dict],
@@ -194,50 +363,33 @@ def ensemble_validate(
 
     A dimension is validated if at least `consensus_threshold` methods agree.
     """
-    validated = []
-
+    # Collect numeric Gemini values and positions up front so the cross-method
+    # matching runs as one batched pass per method
+    numeric = []
     for g_dim in gemini_dims:
         g_value = g_dim.get("value")
         if g_value is None:
-            validated.append(g_dim)
             continue
-
         try:
             g_value = float(g_value)
         except (ValueError, TypeError):
-            validated.append(g_dim)
             continue
+        g_coords = g_dim.get("coordinates") or {}
+        numeric.append((g_dim, g_value, g_coords.get("x", 0), g_coords.get("y", 0)))
 
-        g_coords = g_dim.get("coordinates", {})
-
-        # Find matching values from other methods (within 50px radius)
-        matches = {"gemini": True, "tesseract": False, "cnn": False}
-
-        # Check Tesseract
-        for t_dim in tesseract_dims:
-            if g_value == 0 and t_dim["value"] == 0:
-                matches["tesseract"] = True
-                break
-            if g_value != 0 and abs(g_value - t_dim["value"]) / max(abs(g_value), abs(t_dim["value"])) < 0.01:
-                t_coords = t_dim.get("coordinates", {})
-                dist = ((g_coords.get("x", 0) - t_coords.get("x", 0)) ** 2 +
-                       (g_coords.get("y", 0) - t_coords.get("y", 0)) ** 2) ** 0.5
-                if dist < 50:
-                    matches["tesseract"] = True
-                    break
-
-        # Check CNN
-        for c_dim in cnn_dims:
-            if g_value == 0 and c_dim["value"] == 0:
-                matches["cnn"] = True
-                break
-            if g_value != 0 and abs(g_value - c_dim["value"]) / max(abs(g_value), abs(c_dim["value"])) < 0.01:
-                c_coords = c_dim.get("coordinates", {})
-                dist = ((g_coords.get("x", 0) - c_coords.get("x", 0)) ** 2 +
-                       (g_coords.get("y", 0) - c_coords.get("y", 0)) ** 2) ** 0.5
-                if dist < 50:
-                    matches["cnn"] = True
-                    break
+    g_values = np.array([n[1] for n in numeric], dtype=np.float64)
+    g_xy = np.array([(n[2], n[3]) for n in numeric], dtype=np.float64).reshape(-1, 2)
+
+    # Find matching values from other methods (within 50px radius)
+    tesseract_hits = _match_against_index(_build_value_index(tesseract_dims), g_values, g_xy)
+    cnn_hits = _match_against_index(_build_value_index(cnn_dims), g_values, g_xy)
+
+    for i, (g_dim, g_value, _, _) in enumerate(numeric):
+        matches = {
+            "gemini": True,
+            "tesseract": bool(tesseract_hits[i]),
+            "cnn": bool(cnn_hits[i]),
+        }
 
         # Count consensus
         consensus_count = sum(matches.values())
@@ -255,6 +407,5 @@ def ensemble_validate(
                 f"Value {g_value} only validated by {consensus_count}/3 methods: {matches}"
             )
 
-        validated.append(g_dim)
-
-    return validated
+    # Non-numeric dimensions pass through unvalidated, in original order
+    return list(gemini_dims)
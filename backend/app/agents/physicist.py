@@ -2,19 +2,25 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
+import functools
 import json
 import logging
 import math
 import re
+import weakref
+from collections import defaultdict
 from pathlib import Path
 from typing import Optional
 
 import google.generativeai as genai
+import orjson
 from google.api_core.exceptions import ResourceExhausted
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
 
 from app.config import settings
 from app.agents.state import AuditState, AuditFinding, FindingType, Severity
+from app.services import llm_cache
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +28,9 @@ logger = logging.getLogger(__name__)
 MAX_RETRIES = 5
 INITIAL_BACKOFF = 30  # seconds
 
+# Machine state can carry int keys and NumPy scalars from the OCR stages
+_ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
 # Material densities in kg/m³ - expanded from Machinery Handbook
 MATERIAL_DENSITIES = {
     "steel": 7850,
@@ -76,7 +85,12 @@ MATERIAL_DENSITIES = {
 }
 
 
+@functools.lru_cache(maxsize=1)
 def _load_iso_tables() -> dict:
+    """Load the ISO/Machinery's Handbook tables once per process.
+
+    The returned dict is shared between calls — treat it as read-only.
+    """
     iso_path = Path(__file__).parent.parent / "data" / "iso_tables.json"
     if iso_path.exists():
         with open(iso_path) as f:
@@ -84,34 +98,115 @@ def _load_iso_tables() -> dict:
     return {}
 
 
+# Longest keys first so the most specific material wins
+# (e.g. "stainless steel" before "steel", "304 ss" before "304")
+_DENSITY_KEYS_BY_SPECIFICITY = sorted(MATERIAL_DENSITIES, key=len, reverse=True)
+_DENSITY_KEY_RANK = {key: i for i, key in enumerate(_DENSITY_KEYS_BY_SPECIFICITY)}
+# One scan over the material string: the lookahead reports the longest key
+# starting at every position (alternatives are tried longest-first)
+_MATERIAL_RE = re.compile(
+    "(?=(" + "|".join(map(re.escape, _DENSITY_KEYS_BY_SPECIFICITY)) + "))"
+)
+
+
 def _get_material_density(material_str: str) -> Optional[float]:
     mat_lower = material_str.lower().strip()
-    for key, density in MATERIAL_DENSITIES.items():
-        if key in mat_lower:
-            return density
-    return None
+    matches = [m.group(1) for m in _MATERIAL_RE.finditer(mat_lower)]
+    if not matches:
+        return None
+    return MATERIAL_DENSITIES[min(matches, key=_DENSITY_KEY_RANK.__getitem__)]
 
 
-def _check_tolerance_fit(bore_dim: dict, shaft_dim: dict, iso_tables: dict) -> Optional[dict]:
-    """Check if bore/shaft tolerance classes form a valid fit."""
-    bore_tol = bore_dim.get("tolerance_class", "")
-    shaft_tol = shaft_dim.get("tolerance_class", "")
+# ISO 286 tolerance class letters: uppercase = hole (bore), lowercase = shaft
+_BORE_TOL_LETTERS = frozenset("HJK")
+_SHAFT_TOL_LETTERS = frozenset("gfhknp")
 
-    if not bore_tol or not shaft_tol:
-        return None
 
-    fit_key = f"{bore_tol}/{shaft_tol}"
-    fit_data = iso_tables.get("fits", {}).get(fit_key)
+def _make_fit_checker(iso_tables: dict):
+    """Return a memoized (bore_tol, shaft_tol) → fit check over the ISO tables.
+
+    Drawings repeat the same few fits (H7/g6, H7/k6, ...) across many
+    bore/shaft pairs, so each distinct pair is resolved once.
+    """
+    fits = iso_tables.get("fits", {})
+
+    @functools.lru_cache(maxsize=256)
+    def check(bore_tol: str, shaft_tol: str) -> Optional[dict]:
+        """Check if bore/shaft tolerance classes form a valid fit."""
+        if not bore_tol or not shaft_tol:
+            return None
+
+        fit_key = f"{bore_tol}/{shaft_tol}"
+        fit_data = fits.get(fit_key)
+
+        if fit_data:
+            return {
+                "fit_type": fit_data.get("type", "unknown"),
+                "clearance_min": fit_data.get("clearance_min"),
+                "clearance_max": fit_data.get("clearance_max"),
+                "valid": True,
+            }
+
+        return {"fit_type": "unknown", "valid": False, "note": f"Fit {fit_key} not in ISO tables"}
+
+    return check
+
+
+# Table key → thread category, in lookup priority order
+_THREAD_TABLES = (
+    ("threads_metric_coarse", "metric_coarse"),
+    ("threads_metric_fine", "metric_fine"),
+    ("threads_unc", "UNC"),
+    ("threads_unf", "UNF"),
+)
+# Canonical designator in an (uppercased) callout: M10, M10X1.25, #10-24, 1/4-20, 1-8
+_THREAD_TOKEN_RE = re.compile(r"M\d+(?:\.\d+)?(?:X\d+(?:\.\d+)?)?|#\d+-\d+|\d+(?:/\d+)?-\d+")
+
+
+@functools.lru_cache(maxsize=1)
+def _thread_index() -> dict:
+    """Uppercased designator → (category, size, data) across all thread tables.
+
+    Built once from the cached ISO tables, which are left untouched. Earlier
+    tables win on duplicates, e.g. #10-32 resolves to UNC as in the table scan.
+    """
+    iso_tables = _load_iso_tables()
+    index = {}
+    for table_key, category in _THREAD_TABLES:
+        for size, data in iso_tables.get(table_key, {}).items():
+            index.setdefault(size.upper(), (category, size, data))
+    return index
+
 
-    if fit_data:
+def _format_thread_spec(category: str, size: str, data: dict) -> dict:
+    if category == "metric_coarse":
         return {
-            "fit_type": fit_data.get("type", "unknown"),
-            "clearance_min": fit_data.get("clearance_min"),
-            "clearance_max": fit_data.get("clearance_max"),
-            "valid": True,
+            "thread_type": "metric_coarse",
+            "size": size,
+            "pitch_mm": data.get("pitch_mm"),
+            "tap_drill_mm": data.get("tap_drill_mm"),
+            "clearance_close_mm": data.get("clearance_close_mm"),
+            "clearance_medium_mm": data.get("clearance_medium_mm"),
+            "source": "Machinery's Handbook - Metric Coarse Threads",
         }
-
-    return {"fit_type": "unknown", "valid": False, "note": f"Fit {fit_key} not in ISO tables"}
+    if category == "metric_fine":
+        return {
+            "thread_type": "metric_fine",
+            "size": size,
+            "pitch_mm": data.get("pitch_mm"),
+            "tap_drill_mm": data.get("tap_drill_mm"),
+            "source": "Machinery's Handbook - Metric Fine Threads",
+        }
+    name = "Coarse" if category == "UNC" else "Fine"
+    return {
+        "thread_type": category,
+        "size": size,
+        "tpi": data.get("tpi"),
+        "major_in": data.get("major_in"),
+        "tap_drill_in": data.get("tap_drill_in"),
+        "tap_drill_num": data.get("tap_drill_num"),
+        "source": f"Machinery's Handbook - Unified National {name}",
+    }
 
 
 def _lookup_thread_spec(thread_str: str, iso_tables: dict) -> Optional[dict]:
@@ -120,62 +215,34 @@ def _lookup_thread_spec(thread_str: str, iso_tables: dict) -> Optional[dict]:
     Returns exact pitch diameter, tap drill, and limits.
     """
     thread_str = thread_str.upper().strip()
+    index = _thread_index()
+
+    # Direct lookup on the canonical designator (e.g. "M10", "M10X1.25", "1/4-20")
+    match = _THREAD_TOKEN_RE.search(thread_str)
+    if match:
+        token = match.group(0)
+        hit = index.get(token)
+        if hit is None and "X" in token:
+            # Pitch not in the fine table (e.g. "M6X1") — fall back to the size
+            hit = index.get(token.split("X", 1)[0])
+        if hit is not None:
+            return _format_thread_spec(*hit)
+
+    # Unusual notation — scan the tables by substring
+    for table_key, category in _THREAD_TABLES:
+        for size, data in iso_tables.get(table_key, {}).items():
+            size_upper = size.upper()
+            if size_upper in thread_str or thread_str.startswith(size_upper):
+                return _format_thread_spec(category, size, data)
 
-    # Try metric coarse (e.g., "M6", "M10")
-    metric_coarse = iso_tables.get("threads_metric_coarse", {})
-    for size, data in metric_coarse.items():
-        if size.upper() in thread_str or thread_str.startswith(size.upper()):
-            return {
-                "thread_type": "metric_coarse",
-                "size": size,
-                "pitch_mm": data.get("pitch_mm"),
-                "tap_drill_mm": data.get("tap_drill_mm"),
-                "clearance_close_mm": data.get("clearance_close_mm"),
-                "clearance_medium_mm": data.get("clearance_medium_mm"),
-                "source": "Machinery's Handbook - Metric Coarse Threads",
-            }
-
-    # Try metric fine (e.g., "M6x0.75")
-    metric_fine = iso_tables.get("threads_metric_fine", {})
-    for size, data in metric_fine.items():
-        if size.upper() in thread_str:
-            return {
-                "thread_type": "metric_fine",
-                "size": size,
-                "pitch_mm": data.get("pitch_mm"),
-                "tap_drill_mm": data.get("tap_drill_mm"),
-                "source": "Machinery's Handbook - Metric Fine Threads",
-            }
+    return None
 
-    # Try UNC (e.g., "1/4-20", "#10-24")
-    threads_unc = iso_tables.get("threads_unc", {})
-    for size, data in threads_unc.items():
-        if size in thread_str:
-            return {
-                "thread_type": "UNC",
-                "size": size,
-                "tpi": data.get("tpi"),
-                "major_in": data.get("major_in"),
-                "tap_drill_in": data.get("tap_drill_in"),
-                "tap_drill_num": data.get("tap_drill_num"),
-                "source": "Machinery's Handbook - Unified National Coarse",
-            }
 
-    # Try UNF
-    threads_unf = iso_tables.get("threads_unf", {})
-    for size, data in threads_unf.items():
-        if size in thread_str:
-            return {
-                "thread_type": "UNF",
-                "size": size,
-                "tpi": data.get("tpi"),
-                "major_in": data.get("major_in"),
-                "tap_drill_in": data.get("tap_drill_in"),
-                "tap_drill_num": data.get("tap_drill_num"),
-                "source": "Machinery's Handbook - Unified National Fine",
-            }
-
-    return None
+# Square-key shaft diameter bins (mm): bin i covers [bounds[i], bounds[i+1])
+_KEYWAY_BOUNDS = [6, 8, 10, 12, 17, 22, 30, 38, 44, 50, 58]
+_KEYWAY_KEYS = [
+    f"{lo}-{hi}mm_shaft" for lo, hi in zip(_KEYWAY_BOUNDS, _KEYWAY_BOUNDS[1:])
+]
 
 
 def _lookup_keyway_spec(shaft_diameter_mm: float, iso_tables: dict) -> Optional[dict]:
@@ -186,35 +253,31 @@ def _lookup_keyway_spec(shaft_diameter_mm: float, iso_tables: dict) -> Optional[
     keyways = iso_tables.get("keyways", {}).get("square_keys_metric", {})
 
     # Find the appropriate size range
-    ranges = [
-        (6, 8, "6-8mm_shaft"),
-        (8, 10, "8-10mm_shaft"),
-        (10, 12, "10-12mm_shaft"),
-        (12, 17, "12-17mm_shaft"),
-        (17, 22, "17-22mm_shaft"),
-        (22, 30, "22-30mm_shaft"),
-        (30, 38, "30-38mm_shaft"),
-        (38, 44, "38-44mm_shaft"),
-        (44, 50, "44-50mm_shaft"),
-        (50, 58, "50-58mm_shaft"),
-    ]
-
-    for min_d, max_d, key in ranges:
-        if min_d <= shaft_diameter_mm < max_d:
-            data = keyways.get(key)
-            if data:
-                return {
-                    "shaft_range": f"{min_d}-{max_d}mm",
-                    "key_width_mm": data.get("key_width_mm"),
-                    "key_height_mm": data.get("key_height_mm"),
-                    "keyway_depth_shaft_mm": data.get("keyway_depth_shaft_mm"),
-                    "keyway_depth_hub_mm": data.get("keyway_depth_hub_mm"),
-                    "source": "Machinery's Handbook - Square Keys (Metric)",
-                }
+    idx = bisect.bisect_right(_KEYWAY_BOUNDS, shaft_diameter_mm) - 1
+    if idx < 0 or idx >= len(_KEYWAY_KEYS):
+        return None
+
+    data = keyways.get(_KEYWAY_KEYS[idx])
+    if data:
+        return {
+            "shaft_range": f"{_KEYWAY_BOUNDS[idx]}-{_KEYWAY_BOUNDS[idx + 1]}mm",
+            "key_width_mm": data.get("key_width_mm"),
+            "key_height_mm": data.get("key_height_mm"),
+            "keyway_depth_shaft_mm": data.get("keyway_depth_shaft_mm"),
+            "keyway_depth_hub_mm": data.get("keyway_depth_hub_mm"),
+            "source": "Machinery's Handbook - Square Keys (Metric)",
+        }
 
     return None
 
 
+# Common thread callouts checked against the handbook tables
+THREAD_PATTERNS = ["M3", "M4", "M5", "M6", "M8", "M10", "M12", "M16", "M20",
+                   "1/4-20", "5/16-18", "3/8-16", "1/2-13", "#10-24", "#8-32"]
+# Lookahead so overlapping callouts are all reported, like per-pattern `in` checks
+_THREAD_RE = re.compile("(?=(" + "|".join(map(re.escape, THREAD_PATTERNS)) + "))")
+
+
 def _calculate_theoretical_weight(volume_mm3: float, material: str) -> Optional[dict]:
     """
     Calculate theoretical weight using Volume × Density.
@@ -318,61 +381,159 @@ EXISTING FINDINGS:
 """
 
 
-async def run_physicist(state: AuditState) -> AuditState:
-    """Run physics and tolerance calculations."""
-    genai.configure(api_key=settings.GOOGLE_API_KEY)
+# Constrained-decoding schema matching the JSON shape PHYSICIST_PROMPT asks for,
+# so the response parses directly instead of via the bracket-slice fallback
+PHYSICIST_RESPONSE_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "finding_type": {
+                "type": "STRING",
+                "enum": ["PHYSICS_FAIL", "FIT_ERROR", "MATERIAL_ERROR"],
+            },
+            "severity": {"type": "STRING", "enum": ["critical", "warning"]},
+            "category": {
+                "type": "STRING",
+                "enum": ["fit", "bearing", "thread", "mass", "structure", "material"],
+            },
+            "description": {"type": "STRING"},
+            "affected_features": {"type": "ARRAY", "items": {"type": "STRING"}},
+            "coordinates": {
+                "type": "OBJECT",
+                "properties": {"x": {"type": "NUMBER"}, "y": {"type": "NUMBER"}},
+            },
+            "item_number": {"type": "STRING", "nullable": True},
+            "zone": {"type": "STRING", "nullable": True},
+            "evidence": {
+                "type": "OBJECT",
+                "properties": {
+                    "calculated": {"type": "STRING"},
+                    "specified": {"type": "STRING"},
+                    "formula": {"type": "STRING"},
+                    "handbook_reference": {"type": "STRING"},
+                },
+            },
+            "recommendation": {"type": "STRING"},
+        },
+        "required": ["finding_type", "severity", "description"],
+    },
+}
+# Same ceiling as the ingestor — on gemini-2.5-pro thinking tokens count
+# toward this limit, so a tight cap truncates findings on large drawings
+PHYSICIST_MAX_OUTPUT_TOKENS = 65536
+_FINISH_MAX_TOKENS = 2  # Candidate.FinishReason.MAX_TOKENS
+
+
+def _split_prompt_template(template: str) -> tuple[str, str, str]:
+    """Split PHYSICIST_PROMPT around its two fields, unescaping literal braces."""
+    prefix, rest = template.split("{machine_state}")
+    middle, suffix = rest.split("{findings}")
+    return tuple(
+        part.replace("{{", "{").replace("}}", "}") for part in (prefix, middle, suffix)
+    )
 
-    machine_state = state.get("machine_state", {})
-    existing_findings = state.get("findings", [])
+
+# Pre-split once so each call is a plain join of multi-KB strings,
+# not a str.format parse of the template
+_PROMPT_PREFIX, _PROMPT_MIDDLE, _PROMPT_SUFFIX = _split_prompt_template(PHYSICIST_PROMPT)
+
+# One model per event loop: the SDK's async gRPC client is bound to the loop
+# it was created on, and callers like testbed_ui.py run several asyncio.run()
+# in one process
+_models: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, genai.GenerativeModel]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_model() -> genai.GenerativeModel:
+    """Configure Gemini and build the reasoning model once per event loop.
+
+    Generation config and safety settings are passed per call, so the
+    instance is safe to share between concurrent audits on the same loop.
+    """
+    loop = asyncio.get_running_loop()
+    model = _models.get(loop)
+    if model is None:
+        # configure() drops the SDK's cached clients, so the new model gets
+        # an async client created on this loop
+        genai.configure(api_key=settings.GOOGLE_API_KEY)
+        model = genai.GenerativeModel(settings.REASONING_MODEL)
+        _models[loop] = model
+    return model
+
+
+def _fit_finding(bore: dict, shaft: dict, result: dict) -> dict:
+    """Finding for an unverified bore/shaft fit, as a plain dict.
+
+    Built from our own typed values, so it skips the AuditFinding
+    validate-and-dump round trip; keys match AuditFinding.model_dump().
+    """
+    return {
+        "finding_type": FindingType.PHYSICS_FAIL,
+        "severity": Severity.WARNING,
+        "description": f"Tolerance fit {bore.get('tolerance_class')}/{shaft.get('tolerance_class')} not verified in ISO tables",
+        "coordinates": dict(bore.get("coordinates") or {}),
+        "source_agent": "physicist",
+        "evidence": dict(result),  # cached — don't share it
+        "item_number": bore.get("item_number"),
+        "category": None,
+        "zone": None,
+        "affected_features": [],
+        "recommendation": None,
+        "nearest_balloon": None,
+        "grid_ref": None,
+    }
+
+
+def _run_local_checks(machine_state: dict) -> list[dict]:
+    """Deterministic fit/thread/keyway checks against the handbook tables."""
     iso_tables = _load_iso_tables()
 
-    # Local tolerance checks
+    check_fit = _make_fit_checker(iso_tables)
+
     local_findings = []
     dimensions = machine_state.get("dimensions", [])
 
     # Find bore/shaft pairs by looking for matching zones
-    bore_dims = [d for d in dimensions if (d.get("tolerance_class") or "").startswith(("H", "J", "K"))]
-    shaft_dims = [d for d in dimensions if (d.get("tolerance_class") or "").startswith(("g", "f", "h", "k", "n", "p"))]
+    # One pass over dimensions: classify by the tolerance class's leading letter
+    bore_dims, shaft_dims = [], []
+    for d in dimensions:
+        tol = d.get("tolerance_class")
+        if not tol:
+            continue
+        if tol[0] in _BORE_TOL_LETTERS:
+            bore_dims.append(d)
+        elif tol[0] in _SHAFT_TOL_LETTERS:
+            shaft_dims.append(d)
+
+    # Hash-join on zone / item number instead of comparing every bore with
+    # every shaft; buckets hold shaft indices so pairs keep their original order
+    shafts_by_zone = defaultdict(list)
+    shafts_by_item = defaultdict(list)
+    for i, shaft in enumerate(shaft_dims):
+        shafts_by_zone[shaft.get("zone")].append(i)
+        shafts_by_item[shaft.get("item_number")].append(i)
 
     for bore in bore_dims:
-        for shaft in shaft_dims:
-            if bore.get("zone") == shaft.get("zone") or bore.get("item_number") == shaft.get("item_number"):
-                result = _check_tolerance_fit(bore, shaft, iso_tables)
-                if result and not result.get("valid"):
-                    local_findings.append(
-                        AuditFinding(
-                            finding_type=FindingType.PHYSICS_FAIL,
-                            severity=Severity.WARNING,
-                            description=f"Tolerance fit {bore.get('tolerance_class')}/{shaft.get('tolerance_class')} not verified in ISO tables",
-                            coordinates=bore.get("coordinates", {}),
-                            source_agent="physicist",
-                            evidence=result,
-                            item_number=bore.get("item_number"),
-                        ).model_dump()
-                    )
-
-    # Weight validation for part list items
-    part_list = machine_state.get("part_list", [])
-    for part in part_list:
-        weight = part.get("weight")
-        material = part.get("material", "")
-        if weight and material:
-            density = _get_material_density(material)
-            if density and weight > 0:
-                # We can't calculate volume from 2D drawing alone,
-                # but we can flag extreme outliers via Gemini
-                pass
+        # A shaft sharing both zone and item number is still checked once
+        paired = set(shafts_by_zone.get(bore.get("zone"), ()))
+        paired.update(shafts_by_item.get(bore.get("item_number"), ()))
+        for i in sorted(paired):
+            shaft = shaft_dims[i]
+            result = check_fit(bore.get("tolerance_class", ""), shaft.get("tolerance_class", ""))
+            if result and not result.get("valid"):
+                local_findings.append(_fit_finding(bore, shaft, result))
 
     # ATOMIC VERIFICATION: Thread specifications from Machinery's Handbook
     gdt_callouts = machine_state.get("gdt_callouts", [])
     raw_text = machine_state.get("raw_text", "")
     raw_text_str = raw_text if isinstance(raw_text, str) else " ".join(raw_text)
 
-    # Look for thread callouts in dimensions and raw text
-    thread_patterns = ["M3", "M4", "M5", "M6", "M8", "M10", "M12", "M16", "M20",
-                       "1/4-20", "5/16-18", "3/8-16", "1/2-13", "#10-24", "#8-32"]
-    for pattern in thread_patterns:
-        if pattern in raw_text_str:
+    # Look for thread callouts in dimensions and raw text (single regex scan)
+    found_threads = {m.group(1) for m in _THREAD_RE.finditer(raw_text_str)}
+    for pattern in THREAD_PATTERNS:
+        if pattern in found_threads:
             thread_spec = _lookup_thread_spec(pattern, iso_tables)
             if thread_spec:
                 # Log that we found and validated a thread (info level, not a finding)
@@ -389,23 +550,65 @@ async def run_physicist(state: AuditState) -> AuditState:
                     # Keyway spec found - can be used for validation
                     pass
 
-    # Use Gemini for deeper physics reasoning
-    model = genai.GenerativeModel(settings.REASONING_MODEL)
-    prompt = PHYSICIST_PROMPT.format(
-        machine_state=json.dumps(machine_state, indent=2),
-        findings=json.dumps(existing_findings, indent=2),
-    )
+    return local_findings
+
+
+def _build_prompt(machine_state: dict, existing_findings: list) -> str:
+    # Compact JSON — the model doesn't need pretty-printing, and indentation
+    # roughly doubles the prompt size on large drawings
+    return "".join((
+        _PROMPT_PREFIX,
+        orjson.dumps(machine_state, option=_ORJSON_OPTS).decode(),
+        _PROMPT_MIDDLE,
+        orjson.dumps(existing_findings, option=_ORJSON_OPTS).decode(),
+        _PROMPT_SUFFIX,
+    ))
+
+
+def _gemini_finding(f: dict) -> dict:
+    """Convert one Gemini-reported finding into an AuditFinding dict."""
+    # Handle finding_type gracefully
+    try:
+        ftype = FindingType(f.get("finding_type", "PHYSICS_FAIL"))
+    except ValueError:
+        ftype = FindingType.PHYSICS_FAIL
+
+    return AuditFinding(
+        finding_type=ftype,
+        severity=Severity(f.get("severity", "warning")),
+        description=f.get("description", ""),
+        coordinates=f.get("coordinates") or {},
+        source_agent="physicist",
+        evidence=f.get("evidence") or {},
+        item_number=f.get("item_number"),
+        category=f.get("category"),
+        zone=f.get("zone"),
+        affected_features=f.get("affected_features") or [],
+        recommendation=f.get("recommendation"),
+    ).model_dump()
+
+
+async def _generate_findings_text(model: genai.GenerativeModel, prompt: str) -> str:
+    """Send the physicist prompt to Gemini, retrying on rate limits."""
+    key = llm_cache.cache_key(model.model_name, prompt)
+    cached = llm_cache.get(key)
+    if cached is not None:
+        logger.info("Physicist: reusing cached Gemini response")
+        return cached
 
     # Retry logic with exponential backoff for rate limiting
-    logger.info("Physicist: sending prompt to Gemini (%d chars)", len(prompt))
-    response = None
+    resp_text = None
     for attempt in range(MAX_RETRIES):
         try:
+            # Stream the (often long) JSON so chunks are received while the
+            # model is still generating, instead of in one burst at the end
             response = await model.generate_content_async(
                 prompt,
                 generation_config=genai.GenerationConfig(
                     response_mime_type="application/json",
+                    response_schema=PHYSICIST_RESPONSE_SCHEMA,
                     temperature=0.2,
+                    max_output_tokens=PHYSICIST_MAX_OUTPUT_TOKENS,
                 ),
                 safety_settings={
                     HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
@@ -414,7 +617,31 @@ async def run_physicist(state: AuditState) -> AuditState:
                     HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
                 },
                 request_options={"timeout": 600},
+                stream=True,
             )
+            chunks = []
+            async for chunk in response:
+                if chunk.parts:
+                    chunks.append(chunk.text)
+            if not chunks:
+                # Blocked or empty — fail loudly like response.text did, rather
+                # than reporting "no findings"
+                candidates = response.candidates
+                finish_reason = candidates[0].finish_reason if candidates else None
+                logger.error(
+                    "Physicist: Gemini returned no content; prompt_feedback=%s finish_reason=%s",
+                    response.prompt_feedback, finish_reason,
+                )
+                raise ValueError(
+                    f"Gemini returned no content for physicist (finish_reason={finish_reason})"
+                )
+            candidates = response.candidates
+            if candidates and candidates[0].finish_reason == _FINISH_MAX_TOKENS:
+                # Truncated JSON can't be trusted — treat it as unparseable
+                logger.error("Physicist: Gemini response truncated at max_output_tokens")
+                resp_text = ""
+            else:
+                resp_text = "".join(chunks)
             break  # Success, exit retry loop
         except ResourceExhausted as e:
             if attempt < MAX_RETRIES - 1:
@@ -425,25 +652,53 @@ async def run_physicist(state: AuditState) -> AuditState:
                 logger.error("Physicist rate limit exhausted after max retries")
                 raise
 
-    if response is None:
+    if resp_text is None:
         raise RuntimeError("Failed to get response from Gemini API for physicist")
 
-    resp_text = response.text or ""
+    llm_cache.put(key, resp_text)
+    return resp_text
+
+
+async def run_physicist(state: AuditState) -> AuditState:
+    """Run physics and tolerance calculations."""
+    machine_state = state.get("machine_state", {})
+    existing_findings = state.get("findings", [])
+
+    # Prompt serialization is pure CPU on large drawings — keep it off the loop
+    prompt = await asyncio.to_thread(_build_prompt, machine_state, existing_findings)
+
+    # Use Gemini for deeper physics reasoning
+    model = _get_model()
+    logger.info("Physicist: sending prompt to Gemini (%d chars)", len(prompt))
+    llm_task = asyncio.create_task(_generate_findings_text(model, prompt))
+
+    # Local checks don't depend on the model's answer — run them (in a worker
+    # thread) while the request is in flight
+    try:
+        local_findings = await asyncio.to_thread(_run_local_checks, machine_state)
+    except BaseException:
+        llm_task.cancel()
+        raise
+
+    resp_text = await llm_task
+
     logger.info("Physicist: Gemini response length: %d chars", len(resp_text))
     logger.info("Physicist: response preview: %.500s", resp_text[:500])
 
     try:
-        raw_findings = json.loads(resp_text)
+        raw_findings = orjson.loads(resp_text)
         logger.info("Physicist: parsed JSON type=%s", type(raw_findings).__name__)
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.warning("Physicist: JSON parse failed: %s", e)
         text = resp_text
         start = text.find("[")
         end = text.rfind("]") + 1
+        raw_findings = []
         if start >= 0 and end > start:
-            raw_findings = json.loads(text[start:end])
-        else:
-            raw_findings = []
+            try:
+                raw_findings = orjson.loads(text[start:end])
+            except orjson.JSONDecodeError as e:
+                logger.error("Physicist: could not salvage findings JSON: %s", e)
 
     if isinstance(raw_findings, dict):
         raw_findings = raw_findings.get("findings", [raw_findings])
@@ -453,28 +708,7 @@ async def run_physicist(state: AuditState) -> AuditState:
         raw_findings = [item for sublist in raw_findings for item in sublist]
     raw_findings = [f for f in raw_findings if isinstance(f, dict)]
 
-    for f in raw_findings:
-        # Handle finding_type gracefully
-        try:
-            ftype = FindingType(f.get("finding_type", "PHYSICS_FAIL"))
-        except ValueError:
-            ftype = FindingType.PHYSICS_FAIL
-
-        local_findings.append(
-            AuditFinding(
-                finding_type=ftype,
-                severity=Severity(f.get("severity", "warning")),
-                description=f.get("description", ""),
-                coordinates=f.get("coordinates") or {},
-                source_agent="physicist",
-                evidence=f.get("evidence") or {},
-                item_number=f.get("item_number"),
-                category=f.get("category"),
-                zone=f.get("zone"),
-                affected_features=f.get("affected_features") or [],
-                recommendation=f.get("recommendation"),
-            ).model_dump()
-        )
+    local_findings.extend([_gemini_finding(f) for f in raw_findings])
 
     findings = existing_findings + local_findings
 
@@ -488,8 +722,8 @@ async def run_physicist(state: AuditState) -> AuditState:
     agent_log = state.get("agent_log", [])
     agent_log.append(log_entry)
 
+    # LangGraph merges returned keys into the state — return only what changed
     return {
-        **state,
         "findings": findings,
         "agent_log": agent_log,
         "status": "physics_checked",
@@ -76,8 +76,8 @@ async def prepare_rescan(state: AuditState) -> AuditState:
     agent_log = state.get("agent_log", [])
     agent_log.append(log_entry)
 
+    # LangGraph merges returned keys into the state — return only what changed
     return {
-        **state,
         "reflexion_count": reflexion_count + 1,
         "crop_region": crop_region,
         "agent_log": agent_log,
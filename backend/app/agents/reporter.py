@@ -1,18 +1,22 @@
 """Reporter Agent – RFI, inspection sheet, and integrity score generation."""
 from __future__ import annotations
 
-import json
 import logging
 from datetime import datetime, timezone
 
 import google.generativeai as genai
+import orjson
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
 
 from app.config import settings
 from app.agents.state import AuditState
+from app.services import llm_cache
 
 logger = logging.getLogger(__name__)
 
+# Machine state can carry int keys and NumPy scalars from the OCR stages
+_ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
 REPORTER_PROMPT = """You are a mechanical engineering report writer.
 Given the machine state and all audit findings, generate:
 
@@ -52,18 +56,75 @@ FINDINGS:
 """
 
 
+# Constrained-decoding schema matching the JSON shape REPORTER_PROMPT asks for
+REPORTER_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "rfi": {
+            "type": "OBJECT",
+            "properties": {
+                "reference": {"type": "STRING"},
+                "date": {"type": "STRING"},
+                "items": {
+                    "type": "ARRAY",
+                    "items": {
+                        "type": "OBJECT",
+                        "properties": {
+                            "number": {"type": "INTEGER"},
+                            "priority": {"type": "STRING", "enum": ["Critical", "Major", "Minor"]},
+                            "description": {"type": "STRING"},
+                            "zone": {"type": "STRING"},
+                            "resolution": {"type": "STRING"},
+                        },
+                    },
+                },
+            },
+        },
+        "inspection_sheet": {
+            "type": "OBJECT",
+            "properties": {
+                "drawing_ref": {"type": "STRING"},
+                "items": {
+                    "type": "ARRAY",
+                    "items": {
+                        "type": "OBJECT",
+                        "properties": {
+                            "dim_id": {"type": "INTEGER"},
+                            "feature": {"type": "STRING"},
+                            "nominal": {"type": "NUMBER", "nullable": True},
+                            "tolerance": {"type": "STRING"},
+                            "instrument": {"type": "STRING"},
+                            "criteria": {"type": "STRING"},
+                        },
+                    },
+                },
+            },
+        },
+    },
+    "required": ["rfi", "inspection_sheet"],
+}
+# Same ceiling as the ingestor — on gemini-2.5-pro thinking tokens count
+# toward this limit, so a tight cap truncates the report
+REPORTER_MAX_OUTPUT_TOKENS = 65536
+_FINISH_MAX_TOKENS = 2  # Candidate.FinishReason.MAX_TOKENS
+
+
 def _calculate_integrity_score(machine_state: dict, findings: list[dict]) -> float:
     """Calculate integrity score: (verified_dims / total_dims) * 100, penalized by criticals."""
     total_dims = len(machine_state.get("dimensions", []))
     if total_dims == 0:
         return 0.0
 
-    critical_count = sum(1 for f in findings if f.get("severity") == "critical")
-    warning_count = sum(1 for f in findings if f.get("severity") == "warning")
-
-    # Base score from dimension coverage
+    # Severity counts and flagged items in a single pass over the findings
+    critical_count = 0
+    warning_count = 0
     finding_dims = set()
     for f in findings:
+        severity = f.get("severity")
+        if severity == "critical":
+            critical_count += 1
+        elif severity == "warning":
+            warning_count += 1
         item = f.get("item_number")
         if item:
             finding_dims.add(item)
@@ -72,6 +133,7 @@ def _calculate_integrity_score(machine_state: dict, findings: list[dict]) -> flo
     problematic = len(finding_dims)
     verified = max(0, total_dims - problematic)
 
+    # Base score from dimension coverage
     base_score = (verified / total_dims) * 100
 
     # Penalties
@@ -81,25 +143,16 @@ def _calculate_integrity_score(machine_state: dict, findings: list[dict]) -> flo
     return max(0.0, min(100.0, round(base_score, 1)))
 
 
-async def run_reporter(state: AuditState) -> AuditState:
-    """Generate RFI, inspection sheet, and integrity score."""
-    genai.configure(api_key=settings.GOOGLE_API_KEY)
-
-    machine_state = state.get("machine_state", {})
-    findings = state.get("findings", [])
-
-    model = genai.GenerativeModel(settings.REASONING_MODEL)
-    prompt = REPORTER_PROMPT.format(
-        machine_state=json.dumps(machine_state, indent=2),
-        findings=json.dumps(findings, indent=2),
-    )
-
+async def _generate_report_text(model: genai.GenerativeModel, prompt: str) -> str:
+    """Send the reporter prompt to Gemini and return the raw response text."""
     logger.info("Reporter: sending prompt to Gemini (%d chars)", len(prompt))
     response = await model.generate_content_async(
         prompt,
         generation_config=genai.GenerationConfig(
             response_mime_type="application/json",
+            response_schema=REPORTER_RESPONSE_SCHEMA,
             temperature=0.3,
+            max_output_tokens=REPORTER_MAX_OUTPUT_TOKENS,
         ),
         safety_settings={
             HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
@@ -109,23 +162,52 @@ async def run_reporter(state: AuditState) -> AuditState:
         },
         request_options={"timeout": 600},
     )
+    candidates = response.candidates
+    if candidates and candidates[0].finish_reason == _FINISH_MAX_TOKENS:
+        # Truncated JSON can't be trusted — treat it as unparseable
+        logger.error("Reporter: Gemini response truncated at max_output_tokens")
+        return ""
+    return response.text or ""
+
+
+async def run_reporter(state: AuditState) -> AuditState:
+    """Generate RFI, inspection sheet, and integrity score."""
+    genai.configure(api_key=settings.GOOGLE_API_KEY)
+
+    machine_state = state.get("machine_state", {})
+    findings = state.get("findings", [])
+
+    model = genai.GenerativeModel(settings.REASONING_MODEL)
+    # Compact JSON — indentation only adds prompt tokens for the model
+    prompt = REPORTER_PROMPT.format(
+        machine_state=orjson.dumps(machine_state, option=_ORJSON_OPTS).decode(),
+        findings=orjson.dumps(findings, option=_ORJSON_OPTS).decode(),
+    )
 
-    resp_text = response.text or ""
+    key = llm_cache.cache_key(model.model_name, prompt)
+    resp_text = llm_cache.get(key)
+    if resp_text is not None:
+        logger.info("Reporter: reusing cached Gemini response")
+    else:
+        resp_text = await _generate_report_text(model, prompt)
+        llm_cache.put(key, resp_text)
     logger.info("Reporter: Gemini response length: %d chars", len(resp_text))
     logger.info("Reporter: response preview: %.500s", resp_text[:500])
 
     try:
-        report_data = json.loads(resp_text)
+        report_data = orjson.loads(resp_text)
         logger.info("Reporter: parsed JSON type=%s, keys=%s", type(report_data).__name__, list(report_data.keys()) if isinstance(report_data, dict) else "N/A")
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.warning("Reporter: JSON parse failed: %s", e)
         text = resp_text
         start = text.find("{")
         end = text.rfind("}") + 1
+        report_data = {"rfi": {"items": []}, "inspection_sheet": {"items": []}}
         if start >= 0 and end > start:
-            report_data = json.loads(text[start:end])
-        else:
-            report_data = {"rfi": {"items": []}, "inspection_sheet": {"items": []}}
+            try:
+                report_data = orjson.loads(text[start:end])
+            except orjson.JSONDecodeError as e:
+                logger.error("Reporter: could not salvage report JSON: %s", e)
 
     rfi = report_data.get("rfi", {})
     if not isinstance(rfi, dict):
@@ -146,8 +228,8 @@ async def run_reporter(state: AuditState) -> AuditState:
     agent_log = state.get("agent_log", [])
     agent_log.append(log_entry)
 
+    # LangGraph merges returned keys into the state — return only what changed
     return {
-        **state,
         "rfi": rfi,
         "inspection_sheet": inspection_sheet,
         "integrity_score": integrity_score,
@@ -1,23 +1,32 @@
 """Adversarial multi-model drawing review agent.
 
 Round 1: Claude Vision does initial comparison
-Round 2: Gemini audits Claude's findings against the same images
-Round 3: Claude produces final merged report incorporating Gemini's challenges
+Round 2: Gemini does an independent comparison (runs concurrently with Round 1)
+Round 3: Claude produces final merged report reconciling both inspections
 """
 from __future__ import annotations
 
+import asyncio
 import base64
-import json
+import hashlib
+import io
 import logging
+import random
 import re
-import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional
 
 import anthropic
 import cv2
 import numpy as np
+import orjson
 import google.generativeai as genai
+from google.api_core.exceptions import (
+    DeadlineExceeded, InternalServerError, ResourceExhausted, ServiceUnavailable,
+)
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
 import fitz  # PyMuPDF
 from PIL import Image
@@ -72,6 +81,9 @@ def _safe_gemini_text(response) -> str:
 
     return ""
 
+# Symbols stripped from a value before searching OCR text (±, Ø, etc.)
+_VALUE_SYMBOL_RE = re.compile(r"[±Øø⌀°]")
+
 # ── Shared JSON schema ──
 
 RESULT_SCHEMA = """\
@@ -109,6 +121,82 @@ RESULT_SCHEMA = """\
   "summary": "3 dimensions missing, 1 tolerance missing, 1 value modified"
 }"""
 
+# Structured-output form of RESULT_SCHEMA (Gemini response_schema dialect).
+# The text version above stays in the prompts as a worked example.
+_REGION_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "x": {"type": "NUMBER"},
+        "y": {"type": "NUMBER"},
+        "width": {"type": "NUMBER"},
+        "height": {"type": "NUMBER"},
+    },
+    "required": ["x", "y", "width", "height"],
+}
+_MISSING_ITEM_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "value": {"type": "STRING"},
+        "type": {"type": "STRING"},
+        "location": {"type": "STRING"},
+        "description": {"type": "STRING"},
+        "master_region": _REGION_SCHEMA,
+        "check_region": {**_REGION_SCHEMA, "nullable": True},
+    },
+    "required": ["value", "location", "description"],
+}
+REVIEW_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "missing_dimensions": {"type": "ARRAY", "items": _MISSING_ITEM_SCHEMA},
+        "missing_tolerances": {"type": "ARRAY", "items": _MISSING_ITEM_SCHEMA},
+        "modified_values": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "master_value": {"type": "STRING"},
+                    "check_value": {"type": "STRING"},
+                    "location": {"type": "STRING"},
+                    "description": {"type": "STRING"},
+                    "master_region": _REGION_SCHEMA,
+                    "check_region": {**_REGION_SCHEMA, "nullable": True},
+                },
+                "required": ["master_value", "check_value", "location", "description"],
+            },
+        },
+        "summary": {"type": "STRING"},
+    },
+    "required": ["missing_dimensions", "missing_tolerances", "modified_values", "summary"],
+}
+
+
+def _to_json_schema(schema: dict) -> dict:
+    """Convert a Gemini response_schema dict to standard JSON Schema."""
+    out = {}
+    for key, value in schema.items():
+        if key == "type":
+            out["type"] = [value.lower(), "null"] if schema.get("nullable") else value.lower()
+        elif key == "nullable":
+            continue
+        elif key == "properties":
+            out[key] = {name: _to_json_schema(sub) for name, sub in value.items()}
+        elif key == "items":
+            out[key] = _to_json_schema(value)
+        else:
+            out[key] = value
+    return out
+
+
+# Claude reports through a forced tool call, so its output is always a
+# well-formed object matching the schema — no fence stripping or salvage
+_REPORT_TOOL_NAME = "report_findings"
+_REPORT_TOOL = {
+    "name": _REPORT_TOOL_NAME,
+    "description": "Submit the drawing comparison report.",
+    "input_schema": _to_json_schema(REVIEW_RESPONSE_SCHEMA),
+}
+
 INSPECTOR_RULES = """\
 You are a mechanical drawing checker. You will receive two engineering \
 drawings: a MASTER (the reference) and a CHECK (the one being verified).
@@ -306,22 +394,87 @@ pixel-perfect coordinates.
   be refined by OCR/CNN detection automatically."""
 
 
-def _load_image_as_base64(file_path: str) -> tuple[str, str, tuple[int, int]]:
-    """Load a PDF or image file and return (base64_data, media_type, (width, height))."""
+# LRU of encoded drawings keyed by file content hash — the same master is
+# reviewed against many checks (and re-uploaded under new names)
+IMAGE_CACHE_SIZE = 8
+REVIEW_JPEG_QUALITY = 90  # High enough to keep decimal points and thin digits crisp
+REVIEW_MAX_LONG_EDGE = 3072  # Longest edge (px) of PDF renders sent to the review models
+_image_cache: "OrderedDict[str, tuple[bytes, str, tuple[int, int]]]" = OrderedDict()
+_image_cache_lock = threading.Lock()
+
+
+def _load_image(file_path: str) -> tuple[bytes, str, tuple[int, int]]:
+    """Load a PDF or image file and return (image_bytes, media_type, (width, height)).
+
+    Cached by content hash. Only the bytes are kept — the base64 form is
+    derived per review rather than doubling each cache entry.
+    """
     p = Path(file_path)
-    suffix = p.suffix.lower()
+    data = p.read_bytes()
+    key = hashlib.sha256(data).hexdigest()
+
+    with _image_cache_lock:
+        cached = _image_cache.get(key)
+        if cached is not None:
+            _image_cache.move_to_end(key)
+    if cached is not None:
+        logger.info("Image encode cache hit for %s", file_path)
+        return cached
+
+    encoded = _encode_image(data, p.suffix.lower())
+
+    with _image_cache_lock:
+        _image_cache[key] = encoded
+        _image_cache.move_to_end(key)
+        while len(_image_cache) > IMAGE_CACHE_SIZE:
+            _image_cache.popitem(last=False)
+
+    return encoded
+
+
+def _load_image_as_base64(file_path: str) -> tuple[str, str, tuple[int, int], bytes]:
+    """Load a PDF or image file and return
+    (base64_data, media_type, (width, height), image_bytes).
+
+    ``image_bytes`` is the payload that ``base64_data`` encodes, for SDKs that
+    take raw bytes (Gemini) and would otherwise decode the base64 again.
+    """
+    img_bytes, media_type, dims = _load_image(file_path)
+    return base64.standard_b64encode(img_bytes).decode("utf-8"), media_type, dims, img_bytes
+
+
+def warm_image_cache(file_path: str) -> None:
+    """Encode a drawing ahead of time so a later review hits the cache."""
+    try:
+        _load_image(file_path)
+    except Exception as exc:
+        logger.warning("Could not pre-encode %s for review: %s", file_path, exc)
 
+
+def _encode_image(data: bytes, suffix: str) -> tuple[bytes, str, tuple[int, int]]:
+    """Rasterize (PDF) or pass through (image) file bytes for the review models."""
     if suffix == ".pdf":
-        doc = fitz.open(str(p))
+        doc = fitz.open(stream=data, filetype="pdf")
         page = doc[0]
-        mat = fitz.Matrix(2, 2)
-        pix = page.get_pixmap(matrix=mat)
-        img_bytes = pix.tobytes("png")
-        dims = (pix.width, pix.height)
+        # 2x zoom, but cap the long edge — the models downsample anything
+        # bigger, so extra pixels on large sheets are pure upload cost
+        zoom = min(2.0, REVIEW_MAX_LONG_EDGE / max(page.rect.width, page.rect.height))
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        # JPEG is several times smaller than PNG for a rendered page, and the
+        # same payload goes to all three review rounds. Encode via Pillow,
+        # whose bundled libjpeg-turbo is SIMD-accelerated
+        buf = io.BytesIO()
+        Image.frombytes("RGB", (pix.width, pix.height), pix.samples).save(
+            buf, "JPEG", quality=REVIEW_JPEG_QUALITY,
+        )
+        img_bytes = buf.getvalue()
+        # Regions are scaled to the 2x render served by /review/image, which
+        # is not necessarily the size sent to the models
+        display = (page.rect * fitz.Matrix(2, 2)).irect
+        dims = (display.width, display.height)
         doc.close()
-        return base64.standard_b64encode(img_bytes).decode("utf-8"), "image/png", dims
+        return img_bytes, "image/jpeg", dims
 
-    img_bytes = p.read_bytes()
     media_types = {
         ".png": "image/png",
         ".jpg": "image/jpeg",
@@ -334,29 +487,44 @@ def _load_image_as_base64(file_path: str) -> tuple[str, str, tuple[int, int]]:
     media_type = media_types.get(suffix, "image/png")
 
     # Get image dimensions using Pillow
-    with Image.open(p) as img:
+    with Image.open(io.BytesIO(data)) as img:
         dims = img.size  # (width, height)
 
-    return base64.standard_b64encode(img_bytes).decode("utf-8"), media_type, dims
+    return data, media_type, dims
+
+
+# Optional ```json ... ``` fence around the whole response
+_FENCE_RE = re.compile(r"^```(?:json)?\s*\n?(.*?)\n?```\s*$", re.DOTALL)
 
 
 def _parse_json(raw: str) -> dict | None:
     """Try to extract JSON from a response that may have markdown fences."""
     text = raw.strip()
-    if text.startswith("```"):
-        text = text.split("\n", 1)[1] if "\n" in text else text[3:]
-        if text.endswith("```"):
-            text = text[:-3]
-        text = text.strip()
+    m = _FENCE_RE.match(text)
+    if m:
+        text = m.group(1).strip()
     try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        logger.error("JSON parse failed: %s", text[:500])
-        return None
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        pass
+    # Salvage the outermost object when the model added prose around it
+    start = text.find("{")
+    end = text.rfind("}") + 1
+    if start >= 0 and end > start:
+        try:
+            return orjson.loads(text[start:end])
+        except orjson.JSONDecodeError:
+            pass
+    logger.error("JSON parse failed: %s", text[:500])
+    return None
 
 
 def _image_content_blocks(master_b64, master_media, check_b64, check_media):
-    """Build the image content blocks for Claude messages."""
+    """Build the image content blocks for Claude messages.
+
+    The breakpoint on the last image caches the system prompt + both images,
+    so Round 3 reuses Round 1's prefix instead of re-processing the images.
+    """
     return [
         {"type": "text", "text": "MASTER drawing:"},
         {
@@ -375,6 +543,7 @@ def _image_content_blocks(master_b64, master_media, check_b64, check_media):
                 "media_type": check_media,
                 "data": check_b64,
             },
+            "cache_control": {"type": "ephemeral"},
         },
     ]
 
@@ -417,37 +586,43 @@ def _scale_review_regions(
 
 # ── OCR-based coordinate detection ──
 
+# Longest edge (px) of PDF rasterizations used for OCR region refinement
+OCR_MAX_LONG_EDGE = 3500
 
-def _rasterize_for_ocr(file_path: str) -> str:
-    """Ensure we have a rasterized image file for OCR.
 
-    If file_path is a PDF, rasterize it to a temp PNG and return that path.
-    Otherwise return the original path.
+def _load_ocr_image(file_path: str) -> Optional[np.ndarray]:
+    """Load a drawing as a grayscale array for OCR.
+
+    PDFs are rasterized straight from the pixmap buffer — no temp PNG is
+    written and re-decoded by each OCR engine.
     """
     p = Path(file_path)
     if p.suffix.lower() == ".pdf":
         doc = fitz.open(str(p))
         page = doc[0]
-        pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
-        tmp = tempfile.NamedTemporaryFile(suffix=".png", delete=False)
-        pix.save(tmp.name)
+        # 2x zoom, but cap the long edge — OCR cost grows with pixel count and
+        # large sheets (A1/E-size) gain nothing past this resolution
+        zoom = min(2.0, OCR_MAX_LONG_EDGE / max(page.rect.width, page.rect.height))
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        rgb = np.frombuffer(pix.samples, dtype=np.uint8).reshape(
+            pix.height, pix.stride
+        )[:, : pix.width * pix.n].reshape(pix.height, pix.width, pix.n)
         doc.close()
-        logger.info("Rasterized PDF → %s for OCR", tmp.name)
-        return tmp.name
-    return str(p)
+        logger.info("Rasterized PDF %s (%dx%d) for OCR", p.name, pix.width, pix.height)
+        return cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+
+    img = cv2.imread(str(p), cv2.IMREAD_GRAYSCALE)
+    if img is None:
+        logger.warning("Could not load image for OCR: %s", file_path)
+    return img
 
 
-def _batch_ocr_detect(image_path: str) -> List[Dict]:
+def _batch_ocr_detect(img: np.ndarray, source: str) -> List[Dict]:
     """Run OCR once on the full image, return all detected text with coordinates."""
     import pytesseract
     from pytesseract import Output
 
-    img = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
-    if img is None:
-        logger.warning("Could not load image for OCR: %s", image_path)
-        return []
-
-    img_h, img_w = img.shape
+    img_h, img_w = img.shape[:2]
     detections = []
 
     # Run Tesseract with sparse text mode
@@ -474,19 +649,16 @@ def _batch_ocr_detect(image_path: str) -> List[Dict]:
         except Exception as exc:
             logger.warning("Tesseract psm %d failed: %s", psm, exc)
 
-    logger.info("Tesseract detected %d text regions on %s", len(detections), image_path)
+    logger.info("Tesseract detected %d text regions on %s", len(detections), source)
     return detections
 
 
-def _batch_cnn_detect(image_path: str) -> List[Dict]:
+def _batch_cnn_detect(img: np.ndarray, source: str) -> List[Dict]:
     """Run EasyOCR (CNN) once on the full image, return all detected text."""
     try:
         from app.agents.ocr_engine import extract_dimensions_with_cnn
-        cnn_dims = extract_dimensions_with_cnn(image_path)
+        cnn_dims = extract_dimensions_with_cnn(None, image=img)
 
-        img = cv2.imread(image_path)
-        if img is None:
-            return []
         img_h, img_w = img.shape[:2]
 
         detections = []
@@ -503,20 +675,63 @@ def _batch_cnn_detect(image_path: str) -> List[Dict]:
                 "img_w": img_w,
                 "img_h": img_h,
             })
-        logger.info("EasyOCR detected %d text regions on %s", len(detections), image_path)
+        logger.info("EasyOCR detected %d text regions on %s", len(detections), source)
         return detections
     except Exception as exc:
         logger.warning("CNN detection failed: %s", exc)
         return []
 
 
+def _detect_text_regions(file_path: str) -> tuple[List[Dict], List[Dict]]:
+    """Load one drawing and run batch OCR (+ CNN if enabled) on it.
+
+    Returns (tesseract_detections, cnn_detections).
+    """
+    img = _load_ocr_image(file_path)
+    if img is None:
+        return [], []
+    tess = _batch_ocr_detect(img, file_path)
+    # Batch CNN: only if USE_CNN_OCR is enabled
+    cnn = _batch_cnn_detect(img, file_path) if settings.USE_CNN_OCR else []
+    return tess, cnn
+
+
+def _index_detections(detections: List[Dict]) -> Optional[Dict]:
+    """Precompute percentage-based geometry for a detection list.
+
+    Built once per image so every value lookup is a handful of NumPy ops
+    instead of a Python loop over all detections.
+    """
+    if not detections:
+        return None
+
+    img_w = np.array([d["img_w"] for d in detections], dtype=np.float64)
+    img_h = np.array([d["img_h"] for d in detections], dtype=np.float64)
+    left = np.array([d["left"] for d in detections], dtype=np.float64)
+    top = np.array([d["top"] for d in detections], dtype=np.float64)
+    width = np.array([d["width"] for d in detections], dtype=np.float64)
+    height = np.array([d["height"] for d in detections], dtype=np.float64)
+
+    texts = [d["text"] for d in detections]
+    return {
+        "texts": texts,
+        # One haystack for a cheap "is this value anywhere?" check per lookup
+        "joined": "\n".join(texts),
+        "confidence": np.array([d["confidence"] for d in detections], dtype=np.float64),
+        "cx": (left + width / 2) / img_w * 100,
+        "cy": (top + height / 2) / img_h * 100,
+        "w": np.maximum(width * 2 / img_w * 100, 3),  # padding
+        "h": np.maximum(height * 2 / img_h * 100, 2),
+    }
+
+
 def _find_value_in_detections(
     dimension_value: str,
-    detections: List[Dict],
+    index: Optional[Dict],
     ai_region: Optional[Dict] = None,
 ) -> Optional[Dict]:
-    """Search OCR detections for a dimension value, return percentage-based region."""
-    if not detections:
+    """Search indexed OCR detections for a dimension value, return percentage-based region."""
+    if not index:
         return None
 
     # Build search variants for the value
@@ -530,55 +745,49 @@ def _find_value_in_detections(
     except (ValueError, TypeError):
         pass
     # Also try without special chars (±, Ø, etc.)
-    cleaned = re.sub(r"[±Øø⌀°]", "", dimension_value).strip()
+    cleaned = _VALUE_SYMBOL_RE.sub("", dimension_value).strip()
     if cleaned and cleaned not in search_variants:
         search_variants.append(cleaned)
 
-    best_match = None
-    best_score = 0  # Combined confidence + proximity to AI estimate
+    # Most values have no OCR twin — rule them out with a single substring
+    # scan before testing detections one by one
+    joined = index["joined"]
+    if not any(variant in joined for variant in search_variants):
+        return None
 
-    for det in detections:
-        text = det["text"]
-        conf = det["confidence"]
+    texts = index["texts"]
+    matched = np.fromiter(
+        (any(variant in text for variant in search_variants) for text in texts),
+        dtype=bool,
+        count=len(texts),
+    )
+    if not matched.any():
+        return None
 
-        matched = False
-        for variant in search_variants:
-            if variant in text:
-                matched = True
-                break
+    cx, cy = index["cx"], index["cy"]
 
-        if not matched:
-            continue
+    # Score: confidence + proximity bonus if near AI estimate
+    score = index["confidence"].copy()
+    if ai_region:
+        ai_cx = ai_region.get("x", 50) + ai_region.get("width", 10) / 2
+        ai_cy = ai_region.get("y", 50) + ai_region.get("height", 5) / 2
+        dist = np.hypot(cx - ai_cx, cy - ai_cy)
+        # Bonus for being close to AI estimate (within 20% = full bonus)
+        score += np.maximum(0, 0.3 * (1 - dist / 30))
 
-        img_w = det["img_w"]
-        img_h = det["img_h"]
-
-        # Convert to percentage-based region
-        cx_pct = (det["left"] + det["width"] / 2) / img_w * 100
-        cy_pct = (det["top"] + det["height"] / 2) / img_h * 100
-        w_pct = max(det["width"] * 2 / img_w * 100, 3)  # padding
-        h_pct = max(det["height"] * 2 / img_h * 100, 2)
-
-        # Score: confidence + proximity bonus if near AI estimate
-        score = conf
-        if ai_region:
-            ai_cx = ai_region.get("x", 50) + ai_region.get("width", 10) / 2
-            ai_cy = ai_region.get("y", 50) + ai_region.get("height", 5) / 2
-            dist = ((cx_pct - ai_cx) ** 2 + (cy_pct - ai_cy) ** 2) ** 0.5
-            # Bonus for being close to AI estimate (within 20% = full bonus)
-            proximity_bonus = max(0, 0.3 * (1 - dist / 30))
-            score += proximity_bonus
-
-        if score > best_score:
-            best_score = score
-            best_match = {
-                "x": cx_pct - w_pct / 2,
-                "y": cy_pct - h_pct / 2,
-                "width": w_pct,
-                "height": h_pct,
-            }
+    score = np.where(matched, score, -np.inf)
+    best = int(np.argmax(score))
+    if score[best] <= 0:
+        return None
 
-    return best_match
+    w_pct = float(index["w"][best])
+    h_pct = float(index["h"][best])
+    return {
+        "x": float(cx[best]) - w_pct / 2,
+        "y": float(cy[best]) - h_pct / 2,
+        "width": w_pct,
+        "height": h_pct,
+    }
 
 
 def _refine_regions_with_ocr(
@@ -591,24 +800,20 @@ def _refine_regions_with_ocr(
     Strategy: run OCR/CNN once per image (batch), then match each finding.
     Falls back to AI estimation if OCR/CNN can't find a value.
     """
-    # Rasterize if PDF
-    master_ocr_path = _rasterize_for_ocr(master_path)
-    check_ocr_path = _rasterize_for_ocr(check_path)
-
-    # Batch OCR: run once per image
-    master_tess = _batch_ocr_detect(master_ocr_path)
-    check_tess = _batch_ocr_detect(check_ocr_path)
-
-    # Batch CNN: only if USE_CNN_OCR is enabled
-    master_cnn = []
-    check_cnn = []
-    if settings.USE_CNN_OCR:
-        master_cnn = _batch_cnn_detect(master_ocr_path)
-        check_cnn = _batch_cnn_detect(check_ocr_path)
-
-    # Combine Tesseract + CNN detections per image
-    master_all = master_tess + master_cnn
-    check_all = check_tess + check_cnn
+    # Master and check are independent — rasterize + OCR them concurrently.
+    # Tesseract runs as a subprocess and MuPDF/torch release the GIL, so the
+    # two pipelines genuinely overlap.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        master_future = pool.submit(_detect_text_regions, master_path)
+        check_future = pool.submit(_detect_text_regions, check_path)
+        master_tess, master_cnn = master_future.result()
+        check_tess, check_cnn = check_future.result()
+
+    # Index detections once per image; every finding lookup reuses them
+    master_tess_idx = _index_detections(master_tess)
+    check_tess_idx = _index_detections(check_tess)
+    master_cnn_idx = _index_detections(master_cnn)
+    check_cnn_idx = _index_detections(check_cnn)
 
     stats = {"ocr_detected": 0, "cnn_detected": 0, "ai_fallback": 0}
 
@@ -626,7 +831,7 @@ def _refine_regions_with_ocr(
             ai_master = item.get("master_region")
             if master_val:
                 ocr_match = _find_value_in_detections(
-                    master_val, master_tess, ai_master
+                    master_val, master_tess_idx, ai_master
                 )
                 if ocr_match:
                     item["master_region"] = ocr_match
@@ -635,7 +840,7 @@ def _refine_regions_with_ocr(
                 else:
                     # Try CNN
                     cnn_match = _find_value_in_detections(
-                        master_val, master_cnn, ai_master
+                        master_val, master_cnn_idx, ai_master
                     )
                     if cnn_match:
                         item["master_region"] = cnn_match
@@ -649,14 +854,14 @@ def _refine_regions_with_ocr(
             ai_check = item.get("check_region")
             if check_val and ai_check is not None:
                 ocr_match = _find_value_in_detections(
-                    check_val, check_tess, ai_check
+                    check_val, check_tess_idx, ai_check
                 )
                 if ocr_match:
                     item["check_region"] = ocr_match
                     item["check_detection_method"] = "ocr_detected"
                 else:
                     cnn_match = _find_value_in_detections(
-                        check_val, check_cnn, ai_check
+                        check_val, check_cnn_idx, ai_check
                     )
                     if cnn_match:
                         item["check_region"] = cnn_match
@@ -682,34 +887,87 @@ def _refine_regions_with_ocr(
         stats["ocr_detected"], stats["cnn_detected"], stats["ai_fallback"],
     )
 
-    # Clean up temp files
-    if master_ocr_path != master_path:
-        Path(master_ocr_path).unlink(missing_ok=True)
-    if check_ocr_path != check_path:
-        Path(check_ocr_path).unlink(missing_ok=True)
-
     return result
 
 
+# ── Shared API clients ──
+
+# Review is interactive — retry transient provider errors a few times with a
+# short backoff rather than failing the whole three-round review
+MAX_RETRIES = 4
+INITIAL_BACKOFF = 2  # seconds
+_GEMINI_TRANSIENT_ERRORS = (
+    ResourceExhausted, ServiceUnavailable, DeadlineExceeded, InternalServerError,
+)
+
+_anthropic_client: Optional[anthropic.AsyncAnthropic] = None
+_gemini_model: Optional[genai.GenerativeModel] = None
+
+# Concurrent reviews would otherwise fan out 2-3 Claude + 1 Gemini call each
+# and trip provider rate limits; 429 backoff is slower than simply queueing
+_claude_semaphore = asyncio.Semaphore(max(1, settings.REVIEW_CLAUDE_CONCURRENCY))
+_gemini_semaphore = asyncio.Semaphore(max(1, settings.REVIEW_GEMINI_CONCURRENCY))
+
+
+def _get_anthropic_client() -> anthropic.AsyncAnthropic:
+    """Build the Claude client once so its connection pool stays warm
+    across rounds and across reviews."""
+    global _anthropic_client
+    if _anthropic_client is None:
+        # The SDK retries 408/409/429/5xx itself with jittered backoff
+        _anthropic_client = anthropic.AsyncAnthropic(
+            api_key=settings.ANTHROPIC_API_KEY, max_retries=MAX_RETRIES,
+        )
+    return _anthropic_client
+
+
+def _get_gemini_model() -> genai.GenerativeModel:
+    """Configure Gemini and build the vision model once per process."""
+    global _gemini_model
+    if _gemini_model is None:
+        genai.configure(api_key=settings.GOOGLE_API_KEY)
+        _gemini_model = genai.GenerativeModel(settings.VISION_MODEL)
+    return _gemini_model
+
+
+def _claude_report(message) -> tuple[dict | None, str]:
+    """Extract (parsed_dict, raw_text) from a report_findings tool call."""
+    for block in message.content:
+        if block.type == "tool_use" and block.name == _REPORT_TOOL_NAME:
+            raw = orjson.dumps(block.input).decode()
+            # A truncated call still yields a tool_use block, but with only
+            # part of the report — don't let it pass as a complete result
+            if message.stop_reason == "max_tokens":
+                logger.error("Claude report truncated at max_tokens (%d chars)", len(raw))
+                return None, raw
+            return block.input, raw
+    # Shouldn't happen with a forced tool choice, but keep any text answer
+    raw = "".join(block.text for block in message.content if block.type == "text")
+    return _parse_json(raw), raw
+
+
 # ── Round 1: Claude initial review ──
 
 async def _claude_initial_review(
     client: anthropic.AsyncAnthropic,
-    master_b64: str, master_media: str,
-    check_b64: str, check_media: str,
+    image_blocks: list[dict],
 ) -> tuple[dict | None, str]:
     """Claude does the first pass comparison. Returns (parsed_dict, raw_text)."""
     logger.info("Round 1: Claude initial review")
 
-    message = await client.messages.create(
+    # Streamed: the body arrives while the model is still generating and
+    # long completions stay clear of the SDK's non-streaming timeout
+    async with _claude_semaphore, client.messages.stream(
         model="claude-opus-4-6",
         max_tokens=8096,
         system=INSPECTOR_RULES,
+        tools=[_REPORT_TOOL],
+        tool_choice={"type": "tool", "name": _REPORT_TOOL_NAME},
         messages=[
             {
                 "role": "user",
                 "content": [
-                    *_image_content_blocks(master_b64, master_media, check_b64, check_media),
+                    *image_blocks,
                     {
                         "type": "text",
                         "text": (
@@ -738,44 +996,37 @@ async def _claude_initial_review(
                 ],
             }
         ],
-    )
+    ) as stream:
+        message = await stream.get_final_message()
 
-    raw = message.content[0].text
+    result, raw = _claude_report(message)
     logger.info("Claude round 1: %d chars", len(raw))
-    return _parse_json(raw), raw
+    return result, raw
 
 
-# ── Round 2: Gemini audits Claude's findings ──
+# ── Round 2: Gemini independent audit ──
 
 async def _gemini_audit(
-    master_b64: str, master_media: str,
-    check_b64: str, check_media: str,
-    claude_findings: str,
+    master_bytes: bytes, master_media: str,
+    check_bytes: bytes, check_media: str,
 ) -> tuple[dict | None, str]:
-    """Gemini reviews both drawings AND Claude's findings. Challenges missed items."""
-    logger.info("Round 2: Gemini audit of Claude's findings")
+    """Gemini independently compares both drawings. Returns (parsed_dict, raw_text)."""
+    logger.info("Round 2: Gemini independent audit")
 
-    genai.configure(api_key=settings.GOOGLE_API_KEY)
-    model = genai.GenerativeModel(settings.VISION_MODEL)
+    model = _get_gemini_model()
 
     prompt = f"""{INSPECTOR_RULES}
 
-A previous inspector checked these drawings and reported:
-
-<previous_report>
-{claude_findings}
-</previous_report>
-
 DO YOUR OWN INDEPENDENT CHECK:
 1. Go through each bordered section/view on the MASTER drawing. For each \
    section, list every numerical callout.
 2. Find the same feature in the same section on the CHECK drawing. Compare \
    values DIGIT BY DIGIT including decimal places (0.05 ≠ 0.5, 22 ≠ 2.2).
-3. The previous inspector may have MISSED subtle value modifications — \
-   look carefully for decimal shifts, transposed digits, rounding errors.
-4. The previous inspector may have FALSE POSITIVES — they may have flagged \
-   dimensions that ARE present on the check. Verify each finding and remove \
-   any that are actually present on the check.
+3. Look carefully for subtle value modifications — decimal shifts, \
+   transposed digits, rounding errors.
+4. Before reporting an item as missing, search the CHECK drawing once more \
+   for that exact value in the corresponding section. If it is present, \
+   do not report it.
 5. Produce a COMPLETE report — missing items AND modified values. \
    Use the exact printed section/view names for locations.
 6. For EACH finding, include master_region and check_region bounding \
@@ -786,25 +1037,46 @@ Respond with JSON only:
 {RESULT_SCHEMA}"""
 
     content_parts = [
-        {"inline_data": {"mime_type": master_media, "data": master_b64}},
+        # Raw bytes — a base64 string would just be decoded again by the SDK
+        {"inline_data": {"mime_type": master_media, "data": master_bytes}},
         "MASTER drawing (above)",
-        {"inline_data": {"mime_type": check_media, "data": check_b64}},
+        {"inline_data": {"mime_type": check_media, "data": check_bytes}},
         "CHECK drawing (above)",
         prompt,
     ]
 
-    try:
-        response = await model.generate_content_async(
-            content_parts,
-            generation_config=genai.GenerationConfig(
-                temperature=0.1,
-                max_output_tokens=32768,
-            ),
-            safety_settings=_SAFETY,
-        )
-    except Exception as exc:
-        logger.error("Gemini audit API call failed: %s", exc)
-        return None, f"[Gemini error: {exc}]"
+    for attempt in range(MAX_RETRIES):
+        try:
+            async with _gemini_semaphore:
+                response = await model.generate_content_async(
+                    content_parts,
+                    generation_config=genai.GenerationConfig(
+                        response_mime_type="application/json",
+                        response_schema=REVIEW_RESPONSE_SCHEMA,
+                        temperature=0.1,
+                        max_output_tokens=32768,
+                    ),
+                    safety_settings=_SAFETY,
+                    stream=True,
+                )
+                # Drain the stream; the response aggregates chunks (and the final
+                # finish_reason) so _safe_gemini_text works on it unchanged
+                async for _ in response:
+                    pass
+            break
+        except _GEMINI_TRANSIENT_ERRORS as exc:
+            if attempt == MAX_RETRIES - 1:
+                logger.error("Gemini audit failed after %d attempts: %s", MAX_RETRIES, exc)
+                return None, f"[Gemini error: {exc}]"
+            backoff = INITIAL_BACKOFF * (2 ** attempt) + random.uniform(0, 1)
+            logger.warning(
+                "Gemini audit transient error (%s). Retrying in %.1fs (%d/%d)",
+                exc, backoff, attempt + 2, MAX_RETRIES,
+            )
+            await asyncio.sleep(backoff)
+        except Exception as exc:
+            logger.error("Gemini audit API call failed: %s", exc)
+            return None, f"[Gemini error: {exc}]"
 
     raw = _safe_gemini_text(response)
     if not raw:
@@ -818,23 +1090,24 @@ Respond with JSON only:
 
 async def _claude_final_merge(
     client: anthropic.AsyncAnthropic,
-    master_b64: str, master_media: str,
-    check_b64: str, check_media: str,
+    image_blocks: list[dict],
     claude_report: str,
     gemini_report: str,
 ) -> tuple[dict | None, str]:
     """Claude gets the final word — merges both reports, re-checks the images."""
     logger.info("Round 3: Claude final merge")
 
-    message = await client.messages.create(
+    async with _claude_semaphore, client.messages.stream(
         model="claude-opus-4-6",
         max_tokens=8096,
         system=INSPECTOR_RULES,
+        tools=[_REPORT_TOOL],
+        tool_choice={"type": "tool", "name": _REPORT_TOOL_NAME},
         messages=[
             {
                 "role": "user",
                 "content": [
-                    *_image_content_blocks(master_b64, master_media, check_b64, check_media),
+                    *image_blocks,
                     {
                         "type": "text",
                         "text": (
@@ -879,11 +1152,44 @@ async def _claude_final_merge(
                 ],
             }
         ],
-    )
+    ) as stream:
+        message = await stream.get_final_message()
 
-    raw = message.content[0].text
+    result, raw = _claude_report(message)
     logger.info("Claude round 3 (final): %d chars", len(raw))
-    return _parse_json(raw), raw
+    return result, raw
+
+
+def _dedup(
+    items: List[dict], key_fields: tuple, exclude: frozenset | set = frozenset(),
+) -> tuple[List[dict], set]:
+    """Drop items whose normalized key fields repeat an earlier item or appear
+    in ``exclude``. Returns (unique_items, keys_of_unique_items)."""
+    seen = set()
+    unique = []
+    for item in items:
+        key = tuple(str(item.get(f, "")).strip().lower() for f in key_fields)
+        if key not in seen and key not in exclude:
+            seen.add(key)
+            unique.append(item)
+    return unique, seen
+
+
+def _finding_keys(result: dict) -> set:
+    """Normalized (category, values, location) keys of a parsed review report."""
+    keys = set()
+    for category, fields in (
+        ("missing_dimensions", ("value", "location")),
+        ("missing_tolerances", ("value", "location")),
+        ("modified_values", ("master_value", "check_value", "location")),
+    ):
+        items = result.get(category) or []
+        if not isinstance(items, list):
+            continue
+        for item in items:
+            if isinstance(item, dict):
+                keys.add((category,) + tuple(str(item.get(f, "")).strip().lower() for f in fields))
+    return keys
 
 
 # ── Main entry point ──
@@ -892,38 +1198,76 @@ async def run_review(master_path: str, check_path: str) -> dict:
     """Run adversarial multi-model review.
 
     Round 1: Claude initial review
-    Round 2: Gemini audits Claude's findings
-    Round 3: Claude produces final merged report incorporating Gemini's challenges
+    Round 2: Gemini independent audit (concurrent with Round 1)
+    Round 3: Claude produces final merged report reconciling both
     """
     if not settings.ANTHROPIC_API_KEY:
         raise ValueError("ANTHROPIC_API_KEY is not configured")
     if not settings.GOOGLE_API_KEY:
         raise ValueError("GOOGLE_API_KEY is not configured")
 
-    master_b64, master_media, master_dims = _load_image_as_base64(master_path)
-    check_b64, check_media, check_dims = _load_image_as_base64(check_path)
+    # Rasterizing + encoding is blocking CPU/IO — do both drawings off the loop
+    (
+        (master_b64, master_media, master_dims, master_bytes),
+        (check_b64, check_media, check_dims, check_bytes),
+    ) = await asyncio.gather(
+        asyncio.to_thread(_load_image_as_base64, master_path),
+        asyncio.to_thread(_load_image_as_base64, check_path),
+    )
 
-    client = anthropic.AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+    client = _get_anthropic_client()
+    # Rounds 1 and 3 send the identical image prefix — build it once
+    image_blocks = _image_content_blocks(master_b64, master_media, check_b64, check_media)
 
-    # Round 1: Claude
-    claude_result, claude_raw = await _claude_initial_review(
-        client, master_b64, master_media, check_b64, check_media,
+    # Rounds 1 & 2: the two inspections are independent, so run them together
+    claude_out, gemini_out = await asyncio.gather(
+        _claude_initial_review(client, image_blocks),
+        _gemini_audit(master_bytes, master_media, check_bytes, check_media),
+        return_exceptions=True,
     )
 
-    # Round 2: Gemini audits (non-fatal — if Gemini fails we continue with Claude only)
-    gemini_result, gemini_raw = await _gemini_audit(
-        master_b64, master_media, check_b64, check_media,
-        claude_raw,
-    )
+    # Gemini is non-fatal — if it fails we continue with Claude only
+    if isinstance(gemini_out, BaseException):
+        logger.error("Gemini audit failed: %s", gemini_out)
+        gemini_out = (None, "")
+    gemini_result, gemini_raw = gemini_out
 
     if gemini_result is None and not gemini_raw:
         logger.warning("Gemini audit returned nothing — proceeding with Claude-only results")
 
-    # Round 3: Claude final merge
-    final_result, final_raw = await _claude_final_merge(
-        client, master_b64, master_media, check_b64, check_media,
-        claude_raw, gemini_raw or "[Gemini audit unavailable — rely on your own Round 1 findings]",
-    )
+    # Claude round 1 is only fatal if there is no Gemini report to fall back on.
+    # Round 3 is Claude too, so don't attempt it while Claude is failing
+    claude_failed = isinstance(claude_out, BaseException)
+    if claude_failed:
+        # _gemini_audit reports its own failures as (None, "[Gemini error: …]")
+        # or (None, unparseable_text), so judge it by the parsed result
+        if not isinstance(gemini_result, dict):
+            raise claude_out
+        logger.error("Claude round 1 failed: %s — proceeding with Gemini results", claude_out)
+        claude_out = (None, "")
+    claude_result, claude_raw = claude_out
+
+    if claude_failed:
+        final_result = gemini_result
+    # Round 3 only arbitrates disagreements — when both independent
+    # inspections report exactly the same findings there is nothing to merge
+    elif (
+        settings.REVIEW_SKIP_MERGE_ON_AGREEMENT
+        and claude_result is not None and gemini_result is not None
+        and _finding_keys(claude_result) == _finding_keys(gemini_result)
+    ):
+        logger.info("Round 3 skipped: inspectors agree on all findings")
+        final_result = claude_result
+    else:
+        # Round 3: Claude final merge (a failure falls back to the earlier rounds)
+        try:
+            final_result, _ = await _claude_final_merge(
+                client, image_blocks,
+                claude_raw, gemini_raw or "[Gemini audit unavailable — rely on your own Round 1 findings]",
+            )
+        except Exception as exc:
+            logger.error("Claude round 3 failed: %s — falling back to earlier rounds", exc)
+            final_result = None
 
     if final_result is None:
         # Fallback chain: Gemini → Claude round 1 → empty
@@ -941,37 +1285,17 @@ async def run_review(master_path: str, check_path: str) -> dict:
 
     # ── Server-side deduplication ──
     # Remove duplicates within each list (same value + same location)
-    def _dedup(items, key_fields):
-        seen = set()
-        unique = []
-        for item in items:
-            key = tuple(str(item.get(f, "")).strip().lower() for f in key_fields)
-            if key not in seen:
-                seen.add(key)
-                unique.append(item)
-        return unique
-
-    final_result["missing_dimensions"] = _dedup(
-        final_result["missing_dimensions"], ("value", "location")
+    final_result["modified_values"], modified_keys = _dedup(
+        final_result["modified_values"], ("master_value", "location")
     )
-    final_result["missing_tolerances"] = _dedup(
+    final_result["missing_tolerances"], _ = _dedup(
         final_result["missing_tolerances"], ("value", "location")
     )
-    final_result["modified_values"] = _dedup(
-        final_result["modified_values"], ("master_value", "location")
+    # A value already reported as modified is not also missing
+    final_result["missing_dimensions"], _ = _dedup(
+        final_result["missing_dimensions"], ("value", "location"), exclude=modified_keys
     )
 
-    # Remove from missing_dimensions any value that already appears in modified_values
-    modified_keys = {
-        (str(mv.get("master_value", "")).strip().lower(), mv.get("location", "").strip().lower())
-        for mv in final_result["modified_values"]
-    }
-    final_result["missing_dimensions"] = [
-        md for md in final_result["missing_dimensions"]
-        if (str(md.get("value", "")).strip().lower(), md.get("location", "").strip().lower())
-        not in modified_keys
-    ]
-
     if "summary" not in final_result:
         md = len(final_result["missing_dimensions"])
         mt = len(final_result["missing_tolerances"])
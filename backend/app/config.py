@@ -15,6 +15,16 @@ class Settings(BaseSettings):
     USE_CNN_OCR: bool = True  # Enable/disable CNN-based OCR (EasyOCR)
     CNN_OCR_CONSENSUS_THRESHOLD: int = 2  # 2/3 methods must agree
     CNN_OCR_MIN_CONFIDENCE: float = 0.7  # Minimum confidence for CNN results
+    CNN_OCR_QUANTIZE: bool = True  # EasyOCR's own int8 dynamic quantization on CPU (its default)
+    CNN_OCR_NUM_THREADS: int = 0  # torch intra-op threads for EasyOCR (0 = torch default)
+    OCR_CONCURRENCY: int = 2  # Max OCR jobs running at once across concurrent ingests
+    REVIEW_CLAUDE_CONCURRENCY: int = 4  # Max in-flight Claude calls across concurrent reviews
+    REVIEW_GEMINI_CONCURRENCY: int = 4  # Max in-flight Gemini calls across concurrent reviews
+    REVIEW_SKIP_MERGE_ON_AGREEMENT: bool = True  # Skip Round 3 when both inspections report the same findings
+
+    # LLM response cache
+    LLM_CACHE_ENABLED: bool = False  # Reuse Gemini responses for byte-identical prompts
+    LLM_CACHE_SIZE: int = 128  # Max cached responses (LRU)
 
     model_config = {
         "env_file": str(Path(__file__).resolve().parent.parent / ".env"),
@@ -28,7 +28,7 @@ from app.schemas import (
 )
 from app.agents.comparison_graph import run_comparison
 from app.agents.ingestor import run_ingestor
-from app.agents.review_agent import run_review
+from app.agents.review_agent import run_review, warm_image_cache
 from app.agents.state import AuditState
 from app.services.ws_manager import manager
 from app.services.vector_store import store_machine_state
@@ -257,6 +257,9 @@ async def create_inspection_session(
         str(save_path),
         str(session.id),
     )
+    # The master is reviewed against every check — encode it for the review
+    # agent now (sync task, runs in the threadpool) instead of on first review
+    background_tasks.add_task(warm_image_cache, str(save_path))
 
     return session
 
@@ -0,0 +1,42 @@
+"""In-process cache of LLM responses keyed by a hash of the prompt.
+
+Re-running an audit on an unchanged drawing (or a reflexion loop that
+produces the same prompt) would otherwise pay for an identical Gemini call.
+Disabled by default — see ``LLM_CACHE_ENABLED``.
+"""
+import hashlib
+from collections import OrderedDict
+from typing import Optional
+
+from app.config import settings
+
+_cache: "OrderedDict[str, str]" = OrderedDict()
+
+
+def cache_key(model_name: str, prompt: str) -> str:
+    """Hash the model name and prompt into a compact cache key."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(model_name.encode())
+    h.update(b"\0")
+    h.update(prompt.encode())
+    return h.hexdigest()
+
+
+def get(key: str) -> Optional[str]:
+    """Return a cached response, or None on a miss / when caching is off."""
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    text = _cache.get(key)
+    if text is not None:
+        _cache.move_to_end(key)
+    return text
+
+
+def put(key: str, text: str) -> None:
+    """Store a response, evicting the least recently used entry when full."""
+    if not settings.LLM_CACHE_ENABLED or not text:
+        return
+    _cache[key] = text
+    _cache.move_to_end(key)
+    while len(_cache) > max(1, settings.LLM_CACHE_SIZE):
+        _cache.popitem(last=False)
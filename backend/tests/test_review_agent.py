@@ -0,0 +1,49 @@
+"""Failure handling in the adversarial review pipeline."""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+pytest.importorskip("fitz")
+pytest.importorskip("anthropic")
+pytest.importorskip("google.generativeai")
+
+from app.agents import review_agent  # noqa: E402
+
+
+@pytest.fixture
+def stub_inputs(monkeypatch):
+    """Skip image loading and API client setup."""
+    monkeypatch.setattr(review_agent.settings, "ANTHROPIC_API_KEY", "test")
+    monkeypatch.setattr(review_agent.settings, "GOOGLE_API_KEY", "test")
+    monkeypatch.setattr(
+        review_agent, "_load_image_as_base64",
+        lambda path: ("", "image/jpeg", (100, 100), b""),
+    )
+    monkeypatch.setattr(review_agent, "_get_anthropic_client", lambda: None)
+
+
+@pytest.mark.parametrize("gemini_out", [
+    (None, "[Gemini error: 503 Service Unavailable]"),
+    (None, "not json at all"),
+    (None, ""),
+])
+def test_claude_error_surfaces_when_gemini_also_fails(stub_inputs, monkeypatch, gemini_out):
+    async def claude_down(client, image_blocks):
+        raise RuntimeError("claude down")
+
+    async def gemini_failed(*args):
+        return gemini_out
+
+    async def no_merge(*args):
+        pytest.fail("round 3 must not run when Claude round 1 failed")
+
+    monkeypatch.setattr(review_agent, "_claude_initial_review", claude_down)
+    monkeypatch.setattr(review_agent, "_gemini_audit", gemini_failed)
+    monkeypatch.setattr(review_agent, "_claude_final_merge", no_merge)
+
+    with pytest.raises(RuntimeError, match="claude down"):
+        asyncio.run(review_agent.run_review("master.pdf", "check.pdf"))